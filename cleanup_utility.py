@@ -31,15 +31,28 @@ Programmatic Usage:
 """
 
 import os
+import stat
 import time
 import shutil
 import argparse
 import sys
+import re
 import glob
+import fnmatch
 import logging
+import itertools
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple, Iterable, Container
+
+# fcntl is POSIX-only; reflink cloning is skipped where it is unavailable
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 # Target directories for cleanup
 TARGET_DIRECTORIES = {
@@ -67,6 +80,29 @@ CLEANUP_PATTERNS = {
     'backup_files': '**/cleanup_backup_*',
 }
 
+# Files listed per directory in the cleanup preview
+PREVIEW_SAMPLE_SIZE = 10
+
+# Number of unlinks issued per batch by _batch_unlink
+UNLINK_BATCH_SIZE = 256
+
+# unlinkat relative to an open parent directory, where the platform supports it
+_UNLINK_DIR_FD = os.unlink in os.supports_dir_fd and hasattr(os, 'O_DIRECTORY')
+_RMDIR_DIR_FD = os.rmdir in os.supports_dir_fd and hasattr(os, 'O_DIRECTORY')
+_FWALK_DIR_FD = hasattr(os, 'fwalk') and _UNLINK_DIR_FD and _RMDIR_DIR_FD
+_DIR_OPEN_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0) | getattr(os, 'O_CLOEXEC', 0)
+# shutil.rmtree error hook: onexc (3.12+) receives the exception, the deprecated onerror an exc_info tuple
+_RMTREE_ONEXC = sys.version_info >= (3, 12)
+
+# Worker threads used to copy files during backup
+BACKUP_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Copies queued ahead of the backup workers
+BACKUP_PENDING = BACKUP_WORKERS * 4
+
+# ioctl request for a copy-on-write clone of a whole file (Linux FICLONE)
+FICLONE = 0x40049409
+
 # Module-level logger
 logger = logging.getLogger(__name__)
 
@@ -109,69 +145,81 @@ def cleanup_before_batch_processing(
     # Create utility instance for internal operations
     utility = CleanupUtility()
     
+    # Resolve the working directory once for all protected-file checks
+    cwd = os.getcwd()
+    
     try:
         # Apply retention (logs, reports) and rotate processing.log if oversized
         _apply_retention_policies(stats, silent=silent)
         
-        # Scan directories
+        # Scan standard directories concurrently, then assemble in requested order
+        scan_results = utility.scan_many([d for d in target_directories if d in TARGET_DIRECTORIES])
         directory_info = {}
         for directory in target_directories:
             if directory in TARGET_DIRECTORIES:
                 # Standard directory cleanup
-                file_count, total_size, files = utility.get_directory_info(directory)
+                file_count, total_size, paths, sizes, dirs = scan_results[directory]
                 directory_info[directory] = {
                     'description': TARGET_DIRECTORIES[directory],
                     'file_count': file_count,
                     'total_size': total_size,
-                    'files': files
+                    'paths': paths,
+                    'sizes': sizes,
+                    'dirs': dirs
                 }
             elif directory in CLEANUP_PATTERNS:
                 # Pattern-based cleanup
-                files = _get_files_by_pattern(CLEANUP_PATTERNS[directory], exclude_protected)
-                file_count = len(files)
-                total_size = sum(os.path.getsize(f) for f, _ in files if os.path.exists(f))
+                paths, sizes = _get_files_by_pattern(_COMPILED_PATTERNS[directory], exclude_protected, cwd)
                 directory_info[directory] = {
                     'description': f'Pattern-based cleanup: {CLEANUP_PATTERNS[directory]}',
-                    'file_count': file_count,
-                    'total_size': total_size,
-                    'files': files
+                    'file_count': len(paths),
+                    'total_size': sum(sizes),
+                    'paths': paths,
+                    'sizes': sizes
                 }
         
         # Filter protected files if requested
         if exclude_protected:
-            directory_info = _filter_protected_files(directory_info, stats)
+            directory_info = _filter_protected_files(directory_info, stats, cwd)
         
         # Create backup if requested
         if create_backup and any(info['file_count'] > 0 for info in directory_info.values()):
-            backup_dir = _create_programmatic_backup(directory_info)
-            if backup_dir:
-                stats['backup_created'] = True
-                stats['backup_directory'] = backup_dir
+            try:
+                backup_dir = _create_programmatic_backup(directory_info)
+            except (OSError, RuntimeError) as e:
+                # Never delete files whose requested backup was not made
+                error_msg = f"Backup creation failed, nothing deleted: {e}"
+                stats['errors'].append(error_msg)
                 if not silent:
-                    logger.info(f"Backup created: {backup_dir}")
+                    logger.error(error_msg)
+                return stats
+            stats['backup_created'] = True
+            stats['backup_directory'] = backup_dir
+            if not silent:
+                logger.info(f"Backup created: {backup_dir}")
         
         # Perform cleanup
         for directory, info in directory_info.items():
-            files = info.get('files', [])
-            if files:
+            paths = info.get('paths', [])
+            if paths:
                 if not silent:
-                    logger.info(f"Cleaning {directory}: {len(files)} files")
+                    logger.info(f"Cleaning {directory}: {len(paths)} files")
                 
-                for filepath, size in files:
-                    try:
-                        if os.path.exists(filepath):
-                            os.remove(filepath)
-                            stats['deleted_files'] += 1
-                            stats['deleted_size'] += size
-                    except Exception as e:
-                        error_msg = f"Failed to delete {filepath}: {e}"
+                failures = _batch_unlink(paths)
+                for filepath, size in zip(paths, info['sizes']):
+                    error = failures.get(filepath)
+                    if error is None:
+                        stats['deleted_files'] += 1
+                        stats['deleted_size'] += size
+                    elif not isinstance(error, FileNotFoundError):
+                        error_msg = f"Failed to delete {filepath}: {error}"
                         stats['errors'].append(error_msg)
                         if not silent:
                             logger.warning(error_msg)
                 
-                # Clean up empty directories
+                # Clean up empty directories (the target directory itself is kept)
                 if directory in TARGET_DIRECTORIES:
-                    _cleanup_empty_directories(directory)
+                    _cleanup_empty_directories(info['dirs'], keep=directory)
         
         if not silent:
             logger.info(f"Cleanup complete: {stats['deleted_files']} files deleted ({_format_size(stats['deleted_size'])})")
@@ -181,6 +229,8 @@ def cleanup_before_batch_processing(
         stats['errors'].append(error_msg)
         if not silent:
             logger.error(error_msg)
+    finally:
+        utility.close()
     
     return stats
 
@@ -320,134 +370,716 @@ def _purge_dir_by_policy(dir_path: str, pattern: str, *, max_files: int, keep_da
     except Exception:
         pass
 
-def _get_files_by_pattern(pattern: str, exclude_protected: bool = True) -> List[tuple]:
-    """Get files matching a glob pattern."""
-    files = []
-    for filepath in glob.glob(pattern, recursive=True):
-        if os.path.isfile(filepath):
-            if not exclude_protected or filepath not in PROTECTED_FILES:
-                size = os.path.getsize(filepath)
-                files.append((filepath, size))
-    return files
+@lru_cache(maxsize=8)
+def _protected_abs_paths(cwd: str) -> frozenset:
+    """PROTECTED_FILES as normalized absolute paths relative to the given working directory."""
+    return frozenset(os.path.normpath(os.path.join(cwd, p)) for p in PROTECTED_FILES)
+
+def _abs_path(path: str, cwd: str) -> str:
+    """Normalize path against a known working directory without calling getcwd."""
+    return os.path.normpath(path if path.startswith(os.sep) else cwd + os.sep + path)
+
+def _has_magic(segment: str) -> bool:
+    """Check whether a path segment contains glob wildcards."""
+    return '*' in segment or '?' in segment or '[' in segment
+
+def _compile_pattern(pattern: str) -> Tuple[Tuple[str, Optional[Any]], ...]:
+    """
+    Compile a cleanup glob into (segment, regex) pairs.
+    
+    regex is None for literal segments and for '**'; a trailing '**' matches
+    every file below it.
+    """
+    segments = [segment for segment in pattern.split('/') if segment not in ('', '.')]
+    if segments and segments[-1] == '**':
+        segments.append('*')
+    return tuple(
+        (segment, re.compile(fnmatch.translate(segment)) if segment != '**' and _has_magic(segment) else None)
+        for segment in segments
+    )
+
+def _iter_pattern_matches(segments: Tuple[Tuple[str, Optional[Any]], ...]):
+    """
+    Yield (path, size) for regular files matched by compiled glob segments.
+    
+    Literal segments are resolved with a single isdir/lstat rather than a
+    directory scan; only wildcard segments scan, and '**' descends recursively.
+    Hidden entries are skipped for wildcard segments, as glob does.
+    """
+    stack = [('', 0)]
+    while stack:
+        current, idx = stack.pop()
+        
+        # Descend through literal segments without listing directories
+        while idx < len(segments) and segments[idx][1] is None and segments[idx][0] != '**':
+            path = os.path.join(current, segments[idx][0])
+            if idx == len(segments) - 1:
+                try:
+                    st = os.stat(path, follow_symlinks=False)
+                    if stat.S_ISREG(st.st_mode):
+                        yield path, st.st_size
+                except OSError:
+                    pass
+                break
+            if not os.path.isdir(path):
+                break
+            current, idx = path, idx + 1
+        else:
+            # '**' matches zero or more directories: apply the next segment at this
+            # level and re-queue every subdirectory with '**' still pending
+            recursive = segments[idx][0] == '**'
+            if recursive:
+                idx += 1
+            segment, regex = segments[idx]
+            last = idx == len(segments) - 1
+            try:
+                with os.scandir(current or '.') as it:
+                    for entry in it:
+                        name = entry.name
+                        hidden = name.startswith('.')
+                        path = os.path.join(current, name)
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False)
+                            if recursive and is_dir and not hidden:
+                                stack.append((path, idx - 1))
+                            if hidden and not segment.startswith('.'):
+                                continue
+                            if not (regex.match(name) if regex is not None else name == segment):
+                                continue
+                            if not last:
+                                if is_dir:
+                                    stack.append((path, idx + 1))
+                            elif entry.is_file(follow_symlinks=False):
+                                yield path, entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+# CLEANUP_PATTERNS compiled once at import
+_COMPILED_PATTERNS = {name: _compile_pattern(pattern) for name, pattern in CLEANUP_PATTERNS.items()}
 
-def _filter_protected_files(directory_info: Dict[str, Any], stats: Dict[str, Any]) -> Dict[str, Any]:
-    """Filter out protected files from cleanup lists."""
-    filtered_info = {}
+def _get_files_by_pattern(
+    pattern,
+    exclude_protected: bool = True,
+    cwd: Optional[str] = None
+) -> Tuple[List[str], array]:
+    """
+    Get files matching a glob pattern as parallel (paths, sizes) sequences.
+    
+    pattern is either a compiled entry from _COMPILED_PATTERNS or a glob string.
+    cwd defaults to the current working directory.
+    """
+    if isinstance(pattern, str):
+        pattern = _compile_pattern(pattern)
+    cwd = cwd or os.getcwd()
+    paths = []
+    sizes = array('q')
+    protected = _protected_abs_paths(cwd)
+    for filepath, size in _iter_pattern_matches(pattern):
+        if not exclude_protected or _abs_path(filepath, cwd) not in protected:
+            sizes.append(size)
+            paths.append(filepath)
+    return paths, sizes
+
+def _filter_protected_files(
+    directory_info: Dict[str, Any],
+    stats: Dict[str, Any],
+    cwd: Optional[str] = None
+) -> Dict[str, Any]:
+    """Filter out protected files from cleanup lists (updates directory_info in place)."""
+    cwd = cwd or os.getcwd()
+    protected = _protected_abs_paths(cwd)
     
     for directory, info in directory_info.items():
-        filtered_files = []
-        for filepath, size in info.get('files', []):
-            if filepath in PROTECTED_FILES:
-                stats['protected_files_found'] += 1
-                logger.debug(f"Protected file skipped: {filepath}")
-            else:
-                filtered_files.append((filepath, size))
+        paths = info.get('paths', [])
+        # Common case: nothing protected here, so leave the lists untouched
+        if protected.isdisjoint(_abs_path(filepath, cwd) for filepath in paths):
+            continue
+        
+        keep = [i for i, filepath in enumerate(paths)
+                if _abs_path(filepath, cwd) not in protected]
+        stats['protected_files_found'] += len(paths) - len(keep)
+        logger.debug(f"Protected files skipped in {directory}: {len(paths) - len(keep)}")
         
         # Update info with filtered files
-        filtered_info[directory] = info.copy()
-        filtered_info[directory]['files'] = filtered_files
-        filtered_info[directory]['file_count'] = len(filtered_files)
-        filtered_info[directory]['total_size'] = sum(size for _, size in filtered_files)
+        sizes = info['sizes']
+        info['paths'] = [paths[i] for i in keep]
+        info['sizes'] = array('q', (sizes[i] for i in keep))
+        info['file_count'] = len(keep)
+        info['total_size'] = sum(info['sizes'])
     
-    return filtered_info
+    return directory_info
 
-def _create_programmatic_backup(directory_info: Dict[str, Any]) -> Optional[str]:
-    """Create backup for programmatic cleanup."""
-    try:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_dir = f"cleanup_backup_programmatic_{timestamp}"
-        os.makedirs(backup_dir, exist_ok=True)
+def _check_backup_space(needed: int) -> None:
+    """
+    Fail if the backup filesystem cannot hold needed bytes of copies.
+    
+    Raises:
+        RuntimeError: If free space is below needed plus 5%
+    """
+    if not needed or not hasattr(os, 'statvfs'):
+        return
+    st = os.statvfs('.')
+    free = st.f_bavail * st.f_frsize
+    if free < needed * 1.05:
+        raise RuntimeError(f"Insufficient space for backup: need {_format_size(needed)}, have {_format_size(free)}")
+
+def _create_programmatic_backup(directory_info: Dict[str, Any]) -> str:
+    """
+    Create backup for programmatic cleanup.
+    
+    Raises:
+        OSError, RuntimeError: If the backup could not be completed; files that
+            vanished since the scan are not counted as failures
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_dir = f"cleanup_backup_programmatic_{timestamp}"
+    os.makedirs(backup_dir, exist_ok=True)
+    
+    groups = []
+    for directory, info in directory_info.items():
+        paths = info.get('paths', [])
+        if paths:
+            backup_subdir = os.path.join(backup_dir, directory.replace('/', '_'))
+            # Keep the layout below the target root (pattern matches: below the working
+            # directory) so same-named files from different subdirectories stay apart
+            relpath = _relpath_from(directory if directory in TARGET_DIRECTORIES else os.curdir)
+            groups.append((directory, info['total_size'], lambda paths=paths, sizes=info['sizes'], backup_subdir=backup_subdir, relpath=relpath: (
+                (filepath, os.path.join(backup_subdir, relpath(filepath)), size)
+                for filepath, size in zip(paths, sizes))))
+    
+    failures = [(filepath, error) for filepath, error in _backup_files(groups)
+                if not isinstance(error, FileNotFoundError)]
+    for filepath, error in failures:
+        logger.warning(f"Backup failed for {filepath}: {error}")
+    if failures:
+        raise RuntimeError(f"{len(failures)} files could not be backed up")
+    return backup_dir
+
+def _backup_files(groups: List[Tuple[str, int, Callable[[], Iterable[Tuple[str, str, int]]]]]) -> List[Tuple[str, Exception]]:
+    """
+    Back up files into the working directory, hard-linking where possible.
+    
+    groups holds one (source directory, total size, pairs factory) per directory;
+    the factory yields (source, destination, size). Backups are taken right
+    before the originals are deleted, so a link keeps the data alive without
+    copying it; until the original is deleted both names share one inode.
+    Directories on the backup device are linked file by file first. Files that
+    cannot be linked (EPERM under fs.protected_hardlinks, filesystems without
+    links) and directories on other devices are copied, once free space has
+    been checked against their total size.
+    
+    Raises:
+        RuntimeError: If free space cannot hold the files to copy
+    
+    Returns:
+        List of (source, error) for files that could not be backed up
+    """
+    backup_dev = os.stat('.').st_dev
+    needed = 0
+    unlinked = []
+    other_devices = []
+    created = set()
+    for directory, total_size, pairs in groups:
+        try:
+            same_device = os.stat(directory).st_dev == backup_dev
+        except OSError:
+            # Pattern-based entries are not directories; their files live in the tree
+            same_device = True
+        if not same_device:
+            needed += total_size
+            other_devices.append(pairs)
+            continue
+        for src, dst, size in pairs():
+            dest_dir = os.path.dirname(dst)
+            if dest_dir and dest_dir not in created:
+                os.makedirs(dest_dir, exist_ok=True)
+                created.add(dest_dir)
+            try:
+                os.link(src, dst)
+            except OSError:
+                unlinked.append((src, dst))
+                needed += size
+    
+    _check_backup_space(needed)
+    # Directories on other devices are walked again here rather than held in memory
+    copies = itertools.chain(unlinked, ((src, dst) for pairs in other_devices for src, dst, _ in pairs()))
+    return _copy_files_parallel(copies)
+
+def _fast_copy(src: str, dst: str) -> None:
+    """
+    Copy a file preserving permission bits and timestamps.
+    
+    Tries a copy-on-write clone (FICLONE) first, then an in-kernel
+    os.copy_file_range loop, and finishes any remainder with a buffered copy.
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        st = os.fstat(src_fd)
+        remaining = st.st_size
         
-        for directory, info in directory_info.items():
-            files = info.get('files', [])
-            if files:
-                backup_subdir = os.path.join(backup_dir, directory.replace('/', '_'))
-                os.makedirs(backup_subdir, exist_ok=True)
-                
-                for filepath, _ in files:
-                    if os.path.exists(filepath):
-                        try:
-                            backup_path = os.path.join(backup_subdir, os.path.basename(filepath))
-                            shutil.copy2(filepath, backup_path)
-                        except Exception as e:
-                            logger.warning(f"Backup failed for {filepath}: {e}")
+        if fcntl is not None and remaining:
+            try:
+                fcntl.ioctl(dst_fd, FICLONE, src_fd)
+                remaining = 0
+            except OSError:
+                pass
         
-        return backup_dir
-    except Exception as e:
-        logger.error(f"Backup creation failed: {e}")
-        return None
+        if remaining and hasattr(os, 'copy_file_range'):
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(src_fd, dst_fd, remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            except OSError:
+                pass
+        
+        # Both file offsets have advanced past whatever was already copied
+        if remaining:
+            shutil.copyfileobj(fsrc, fdst)
+        
+        if hasattr(os, 'fchmod'):
+            os.fchmod(dst_fd, stat.S_IMODE(st.st_mode))
+    
+    if not hasattr(os, 'fchmod'):
+        os.chmod(dst, stat.S_IMODE(st.st_mode))
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+def _copy_files_parallel(pairs: Iterable[Tuple[str, str]]) -> List[Tuple[str, Exception]]:
+    """
+    Copy (source, destination) pairs concurrently with _fast_copy.
+    
+    pairs may be a lazy iterator; at most BACKUP_PENDING copies are queued at
+    once, so memory stays bounded. Each destination directory is created once,
+    before its first copy is submitted.
+    
+    Returns:
+        List of (source, error) for copies that failed
+    """
+    failures = []
+    created = set()
+    pending = {}
+    
+    def collect(done):
+        for future in done:
+            error = future.exception()
+            if error is not None:
+                failures.append((pending[future], error))
+            del pending[future]
+    
+    with ThreadPoolExecutor(max_workers=BACKUP_WORKERS) as executor:
+        for src, dst in pairs:
+            dest_dir = os.path.dirname(dst)
+            if dest_dir and dest_dir not in created:
+                os.makedirs(dest_dir, exist_ok=True)
+                created.add(dest_dir)
+            if len(pending) >= BACKUP_PENDING:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done)
+            pending[executor.submit(_fast_copy, src, dst)] = src
+        collect(wait(pending).done)
+    return failures
+
+def _bulk_remove(
+    paths: List[str],
+    failures: Dict[str, OSError],
+    remove: Callable[[str], None] = os.remove
+) -> None:
+    """
+    Remove files under a single try, recording errors in failures.
+    
+    On an error the failed path is recorded and removal resumes from the next
+    index, so the common all-success case never re-enters exception handling.
+    """
+    i = 0
+    while i < len(paths):
+        try:
+            for i in range(i, len(paths)):
+                remove(paths[i])
+            return
+        except OSError as e:
+            failures[paths[i]] = e
+            i += 1
 
-def _cleanup_empty_directories(directory: str) -> None:
-    """Remove empty directories after file cleanup."""
+def _unlink_in_directory(parent: str, paths: List[str], failures: Dict[str, OSError]) -> None:
+    """
+    Remove files sharing one parent directory via unlinkat on a single dir fd.
+    
+    Only the parent path is resolved; each file is then unlinked by name.
+    Falls back to path-based removal if the directory cannot be opened.
+    """
     try:
-        for root, dirs, files in os.walk(directory, topdown=False):
-            if not files and not dirs and root != directory:
-                os.rmdir(root)
-    except Exception as e:
-        logger.debug(f"Empty directory cleanup failed for {directory}: {e}")
+        parent_fd = os.open(parent or '.', _DIR_OPEN_FLAGS)
+    except OSError:
+        _bulk_remove(paths, failures)
+        return
+    try:
+        _bulk_remove(paths, failures, lambda filepath: os.unlink(os.path.basename(filepath), dir_fd=parent_fd))
+    finally:
+        os.close(parent_fd)
+
+def _batch_unlink(
+    paths: List[str],
+    batch_size: int = UNLINK_BATCH_SIZE
+) -> Dict[str, OSError]:
+    """
+    Remove files in fixed-size batches.
+
+    Args:
+        paths: Files to remove
+        batch_size: Number of unlinks issued per batch
+
+    Returns:
+        Dict mapping each path that could not be removed to its error
+    """
+    failures: Dict[str, OSError] = {}
+    for start in range(0, len(paths), batch_size):
+        batch = paths[start:start + batch_size]
+        if _UNLINK_DIR_FD:
+            # Scans list files directory by directory, so consecutive paths share a parent
+            for parent, group in itertools.groupby(batch, key=os.path.dirname):
+                _unlink_in_directory(parent, list(group), failures)
+        else:
+            _bulk_remove(batch, failures)
+    return failures
+
+def _clear_directory(directory: str) -> List[Tuple[str, BaseException]]:
+    """
+    Remove everything inside a directory, subtrees with shutil.rmtree.
+    
+    The directory itself is kept, so its mode and ownership are unchanged.
+    
+    Returns:
+        List of (path, error) for entries that could not be removed
+    """
+    errors = []
+    
+    if _RMTREE_ONEXC:
+        hook = {'onexc': lambda func, path, exc: errors.append((path, exc))}
+    else:
+        hook = {'onerror': lambda func, path, exc_info: errors.append((path, exc_info[1]))}
+    
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError as e:
+        return [(directory, e)]
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path, **hook)
+            else:
+                os.unlink(entry.path)
+        except OSError as e:
+            errors.append((entry.path, e))
+    return errors
+
+def _fwalk_delete(
+    directory: str,
+    on_error: Callable[[str, OSError], None],
+    progress: Optional[Callable[[int, int], None]] = None,
+    only: Optional[Container[str]] = None
+) -> Tuple[int, int]:
+    """
+    Delete files below directory, then the emptied directories, with os.fwalk.
+    
+    The walk is bottom-up and every unlink/rmdir is relative to the open
+    directory fd fwalk yields, so no path is resolved more than once.
+    Symlinks are removed, never followed. The root itself is kept.
+    
+    Args:
+        directory: Tree to delete
+        on_error: Called with (path, error) for each file that could not be removed
+        progress: Optional callback receiving (deleted_files, deleted_size)
+            after every UNLINK_BATCH_SIZE deletions
+        only: If given, just these file paths are deleted; other files, and
+            the directories holding them, stay
+    
+    Returns:
+        Tuple (deleted_files, deleted_size)
+    """
+    deleted_files = deleted_size = 0
+    
+    def remove_file(root, name, root_fd):
+        nonlocal deleted_files, deleted_size
+        if only is not None and os.path.join(root, name) not in only:
+            return
+        try:
+            size = os.stat(name, dir_fd=root_fd, follow_symlinks=False).st_size
+            os.unlink(name, dir_fd=root_fd)
+        except OSError as e:
+            on_error(os.path.join(root, name), e)
+            return
+        deleted_files += 1
+        deleted_size += size
+        if progress is not None and deleted_files % UNLINK_BATCH_SIZE == 0:
+            progress(deleted_files, deleted_size)
+    
+    try:
+        for root, dirnames, filenames, root_fd in os.fwalk(directory, topdown=False):
+            for name in filenames:
+                remove_file(root, name, root_fd)
+            for name in dirnames:
+                try:
+                    os.rmdir(name, dir_fd=root_fd)
+                except NotADirectoryError:
+                    # Symlink to a directory: listed with dirnames but not descended
+                    remove_file(root, name, root_fd)
+                except OSError:
+                    # Not empty or not accessible
+                    continue
+    except RecursionError:
+        # os.fwalk recurses once per directory level (before Python 3.13); finish
+        # pathologically deep trees with the iterative scandir walk
+        done_files, done_size = deleted_files, deleted_size
+        more_files, more_size = _batched_delete(
+            lambda dirs=None: (item for item in _iter_directory(directory, dirs)
+                               if only is None or item[0] in only),
+            on_error,
+            progress and (lambda files, size: progress(done_files + files, done_size + size)),
+            keep=directory
+        )
+        deleted_files += more_files
+        deleted_size += more_size
+    
+    if progress is not None:
+        progress(deleted_files, deleted_size)
+    return deleted_files, deleted_size
+
+def _batched_delete(
+    iter_files: Callable[..., Any],
+    on_error: Callable[[str, OSError], None],
+    progress: Optional[Callable[[int, int], None]] = None,
+    keep: Optional[str] = None
+) -> Tuple[int, int]:
+    """
+    Delete files from a directory walk one UNLINK_BATCH_SIZE batch at a time.
+    
+    Fallback for platforms without os.fwalk; directories visited by the walk
+    are removed afterwards if they ended up empty.
+    
+    Args:
+        iter_files: Factory from get_directory_info(materialize=False)
+        on_error: Called with (path, error) for each file that could not be removed
+        progress: Optional callback receiving (deleted_files, deleted_size) after each batch
+        keep: Directory to leave in place even if empty
+    
+    Returns:
+        Tuple (deleted_files, deleted_size)
+    """
+    deleted_files = deleted_size = 0
+    dirs = []
+    files = iter_files(dirs)
+    while True:
+        batch = list(itertools.islice(files, UNLINK_BATCH_SIZE))
+        if not batch:
+            break
+        
+        failures = _batch_unlink([filepath for filepath, _ in batch])
+        for filepath, size in batch:
+            error = failures.get(filepath)
+            if error is None:
+                deleted_files += 1
+                deleted_size += size
+            else:
+                on_error(filepath, error)
+        
+        if progress is not None:
+            progress(deleted_files, deleted_size)
+    
+    # Clean up empty directories visited during the walk
+    _cleanup_empty_directories(dirs, keep=keep)
+    return deleted_files, deleted_size
+
+def _cleanup_empty_directories(dirs: List[str], keep: Optional[str] = None) -> None:
+    """
+    Remove directories left empty after file cleanup.
+    
+    Args:
+        dirs: Directories recorded while scanning; children are removed before parents
+        keep: Directory to leave in place even if empty
+    """
+    if _RMDIR_DIR_FD:
+        # Deepest first, grouped by parent so each parent is opened once
+        ordered = sorted((d for d in dirs if d != keep), key=lambda d: (-d.count(os.sep), d))
+        for parent, group in itertools.groupby(ordered, key=os.path.dirname):
+            try:
+                parent_fd = os.open(parent or '.', _DIR_OPEN_FLAGS)
+            except OSError:
+                continue
+            try:
+                for directory in group:
+                    try:
+                        os.rmdir(os.path.basename(directory), dir_fd=parent_fd)
+                    except OSError:
+                        # Not empty or not accessible
+                        continue
+            finally:
+                os.close(parent_fd)
+    else:
+        for directory in sorted(dirs, key=len, reverse=True):
+            if directory == keep:
+                continue
+            try:
+                os.rmdir(directory)
+            except OSError:
+                # Not empty or not accessible
+                continue
+
+def _iter_directory(directory: str, dirs: Optional[List[str]] = None):
+    """
+    Yield (path, size) for every file below directory using an os.scandir stack.
+    
+    Sizes come from the cached DirEntry stat. When dirs is given, every visited
+    directory (including the root) is appended to it. A missing root yields
+    nothing, so callers need no separate existence check.
+    """
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                if dirs is not None:
+                    dirs.append(current)
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            yield entry.path, entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        # Skip files that can't be accessed
+                        continue
+        except OSError:
+            # Skip directories that can't be accessed
+            continue
+
+def _summarize_directory(directory: str, sample_size: int = PREVIEW_SAMPLE_SIZE) -> Tuple[int, int, List[Tuple[str, int]]]:
+    """
+    Walk directory once, returning (file_count, total_size, sample).
+    
+    sample holds the first sample_size (path, size) pairs; nothing else is
+    kept, so memory does not grow with the number of files.
+    """
+    files = _iter_directory(directory)
+    sample = list(itertools.islice(files, sample_size))
+    file_count = len(sample)
+    total_size = sum(size for _, size in sample)
+    for _, size in files:
+        file_count += 1
+        total_size += size
+    return file_count, total_size, sample
 
+def _relpath_from(directory: str) -> Callable[[str], str]:
+    """
+    Return a relpath function for paths below directory.
+    
+    Paths produced by walking directory start with it plus a separator, so the
+    prefix is sliced off; anything else goes through os.path.relpath.
+    """
+    prefix = os.path.join(directory, '')
+    cut = len(prefix)
+    
+    def relpath(filepath: str) -> str:
+        if filepath.startswith(prefix):
+            return filepath[cut:]
+        return os.path.relpath(filepath, directory)
+    
+    return relpath
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# Many files (e.g. thumbnails) share exact sizes, so formatted strings are cached
+@lru_cache(maxsize=4096)
 def _format_size(size_bytes: int) -> str:
     """Format file size in human readable format."""
     if size_bytes == 0:
         return "0 B"
     
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} TB"
+    # Each unit spans 10 bits, so the bit length selects it directly
+    unit = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * unit)):.1f} {_SIZE_UNITS[unit]}"
 
 class CleanupUtility:
     """Main cleanup utility class for managing temporary file cleanup operations."""
     
     def __init__(self):
         self.backup_dir = None
+        # Files copied by create_backup, per directory; only these are deleted
+        self.backed_up = {}
         self.total_files = 0
         self.total_size = 0
         self.deleted_files = 0
         self.deleted_size = 0
+        # Shared I/O thread pool, created lazily and reused across phases
+        self._executor = None
         
-    def get_directory_info(self, directory):
-        """Get information about files in a directory."""
-        if not os.path.exists(directory):
-            return 0, 0, []
-            
-        files = []
-        total_files = 0
-        total_size = 0
+    def _get_executor(self):
+        """Return the shared I/O thread pool, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=len(TARGET_DIRECTORIES))
+        return self._executor
+    
+    def close(self):
+        """Shut down the shared thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    def scan_many(self, directories, materialize=True):
+        """Scan several directories concurrently; returns {directory: get_directory_info(directory)}."""
+        executor = self._get_executor()
+        futures = {executor.submit(self.get_directory_info, directory, materialize): directory
+                   for directory in directories}
+        results = {}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+        return results
         
-        try:
-            for root, dirs, filenames in os.walk(directory):
-                for filename in filenames:
-                    filepath = os.path.join(root, filename)
-                    try:
-                        size = os.path.getsize(filepath)
-                        files.append((filepath, size))
-                        total_files += 1
-                        total_size += size
-                    except (OSError, FileNotFoundError):
-                        # Skip files that can't be accessed
-                        continue
-                        
-        except (OSError, PermissionError):
-            # Skip directories that can't be accessed
-            pass
+    def get_directory_info(self, directory, materialize=True, exists=True):
+        """
+        Get information about files in a directory.
+        
+        Pass exists=False when the root is already known to be missing to skip
+        the walk entirely.
+        
+        Returns:
+            With materialize=True, a tuple (file_count, total_size, paths, sizes, dirs)
+            where paths and sizes are parallel sequences and dirs lists every
+            directory visited, including the root.
+            With materialize=False, a tuple (file_count, total_size, sample, iter_factory)
+            where sample holds the first PREVIEW_SAMPLE_SIZE (path, size) pairs and
+            iter_factory(dirs=None) re-scans the directory yielding (path, size).
+        """
+        if not materialize:
+            def iter_factory(dirs=None):
+                return _iter_directory(directory, dirs)
+            if not exists:
+                return 0, 0, [], iter_factory
+            return (*_summarize_directory(directory), iter_factory)
+        
+        paths = []
+        sizes = array('q')
+        dirs = []
+        if not exists:
+            return 0, 0, paths, sizes, dirs
+        for filepath, size in _iter_directory(directory, dirs):
+            paths.append(filepath)
+            sizes.append(size)
             
-        return total_files, total_size, files
+        return len(paths), sum(sizes), paths, sizes, dirs
     
-    def format_size(self, size_bytes):
-        """Convert bytes to human readable format."""
-        if size_bytes == 0:
-            return "0 B"
-        
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} TB"
+    # Convert bytes to human readable format
+    format_size = staticmethod(_format_size)
     
     def scan_directories(self):
-        """Scan all target directories and collect file information."""
+        """
+        Scan all target directories and collect file information.
+        
+        Only counts, sizes and a short preview 'sample' are kept; each entry gets
+        an 'iter_files' factory that re-scans the directory when files are needed.
+        """
         print("🔍 Scanning directories...")
         print("=" * 60)
         
@@ -455,17 +1087,26 @@ class CleanupUtility:
         self.total_files = 0
         self.total_size = 0
         
+        # Directories are independent; scan them concurrently and print each one in
+        # declaration order as soon as its result is ready
+        # Stat each root once; missing roots skip the walk and reuse the result for display
+        roots = {directory: os.path.isdir(directory) for directory in TARGET_DIRECTORIES}
+        executor = self._get_executor()
+        futures = {directory: executor.submit(self.get_directory_info, directory, False, roots[directory])
+                   for directory in TARGET_DIRECTORIES}
+        
         for directory, description in TARGET_DIRECTORIES.items():
-            file_count, total_size, files = self.get_directory_info(directory)
+            file_count, total_size, sample, iter_files = futures[directory].result()
             directory_info[directory] = {
                 'description': description,
                 'file_count': file_count,
                 'total_size': total_size,
-                'files': files
+                'sample': sample,
+                'iter_files': iter_files
             }
             
             # Display directory information
-            status = "📁" if os.path.exists(directory) else "❌"
+            status = "📁" if roots[directory] else "❌"
             print(f"{status} {directory:<25} | {file_count:>3} files | {self.format_size(total_size):>8}")
             if file_count > 0:
                 print(f"   └─ {description}")
@@ -496,20 +1137,38 @@ class CleanupUtility:
             file_count = info.get('file_count', 0)
             selections[directory] = file_count > 0  # Only select directories with files
         
+        # Number of terminal lines taken by the previous frame (including the prompt)
+        last_lines = 0
+        
+        # Parts of the frame that never change between redraws
+        separator = "=" * 60 + "\n"
+        header = "📋 Directory Selection:\n" + separator
+        commands = "\nCommands: [1-3] toggle directory | [a] all | [n] none | [d] done | [q] quit\n"
+        
+        # Counts don't change while selecting, so each row is rendered once with
+        # only the color and status left to fill in per frame
+        rows = []
+        for i, (directory, description) in enumerate(TARGET_DIRECTORIES.items(), 1):
+            info = directory_info.get(directory, {})
+            file_count = info.get('file_count', 0)
+            total_size = info.get('total_size', 0)
+            tail = f" {directory:<25} | {file_count:>3} files | {self.format_size(total_size):>8}\033[0m\n"
+            if file_count > 0:
+                tail += f"   └─ {description}\n"
+            rows.append((directory, file_count, total_size, f"{i}. ", tail))
+        
         while True:
-            # Display current selections
-            print("\033[2J\033[H", end="")  # Clear screen
-            print("📋 Directory Selection:")
-            print("=" * 60)
+            # Display current selections: build the whole frame, then redraw it
+            # over the previous one instead of clearing the screen
+            parts = []
+            if last_lines:
+                parts.append(f"\033[{last_lines}F\033[J")  # Cursor up to frame start, clear below
+            parts.append(header)
             
             selected_files = 0
             selected_size = 0
             
-            for i, (directory, description) in enumerate(TARGET_DIRECTORIES.items(), 1):
-                info = directory_info.get(directory, {})
-                file_count = info.get('file_count', 0)
-                total_size = info.get('total_size', 0)
-                
+            for directory, file_count, total_size, head, tail in rows:
                 if file_count == 0:
                     status = "⚪"  # No files
                     color = "\033[90m"  # Gray
@@ -522,14 +1181,16 @@ class CleanupUtility:
                     status = "❌"  # Not selected
                     color = "\033[91m"  # Red
                 
-                print(f"{color}{i}. {status} {directory:<25} | {file_count:>3} files | {self.format_size(total_size):>8}\033[0m")
-                if file_count > 0:
-                    print(f"   └─ {description}")
+                parts.append(color + head + status + tail)
             
-            print("=" * 60)
-            print(f"📊 SELECTED: {selected_files} files, {self.format_size(selected_size)}")
-            print()
-            print("Commands: [1-3] toggle directory | [a] all | [n] none | [d] done | [q] quit")
+            parts.append(separator)
+            parts.append(f"📊 SELECTED: {selected_files} files, {self.format_size(selected_size)}\n")
+            parts.append(commands)
+            
+            frame = "".join(parts)
+            sys.stdout.write(frame)
+            sys.stdout.flush()
+            last_lines = frame.count("\n") + 1
             
             try:
                 choice = input("➤ ").strip().lower()
@@ -576,28 +1237,29 @@ class CleanupUtility:
         try:
             os.makedirs(self.backup_dir, exist_ok=True)
             
+            def backup_pairs(directory, info):
+                backup_subdir = os.path.join(self.backup_dir, directory)
+                # Create relative path structure in backup
+                relpath = _relpath_from(directory)
+                copied = self.backed_up.setdefault(directory, set())
+                
+                def pairs():
+                    for filepath, size in info['iter_files']():
+                        copied.add(filepath)
+                        yield filepath, os.path.join(backup_subdir, relpath(filepath)), size
+                return pairs
+            
+            groups = []
             for directory in selected_directories:
                 info = directory_info.get(directory, {})
-                files = info.get('files', [])
-                
-                if files:
-                    backup_subdir = os.path.join(self.backup_dir, directory)
-                    os.makedirs(backup_subdir, exist_ok=True)
-                    
-                    for filepath, size in files:
-                        try:
-                            # Create relative path structure in backup
-                            rel_path = os.path.relpath(filepath, directory)
-                            backup_path = os.path.join(backup_subdir, rel_path)
-                            backup_dir = os.path.dirname(backup_path)
-                            
-                            if backup_dir:
-                                os.makedirs(backup_dir, exist_ok=True)
-                            
-                            shutil.copy2(filepath, backup_path)
-                            
-                        except (OSError, shutil.Error) as e:
-                            print(f"⚠️  Backup failed for {filepath}: {e}")
+                if info.get('file_count'):
+                    groups.append((directory, info.get('total_size', 0), backup_pairs(directory, info)))
+            
+            # Back up while walking, without building the whole copy plan first
+            for filepath, error in _backup_files(groups):
+                print(f"⚠️  Backup failed for {filepath}: {error}")
+                for copied in self.backed_up.values():
+                    copied.discard(filepath)
             
             print(f"✅ Backup created successfully in '{self.backup_dir}'")
             
@@ -607,6 +1269,7 @@ class CleanupUtility:
             if response != 'y':
                 print("🚫 Cleanup cancelled.")
                 sys.exit(0)
+            self.backup_dir = None
     
     def preview_cleanup(self, selected_directories, directory_info):
         """Show preview of what would be deleted."""
@@ -618,20 +1281,21 @@ class CleanupUtility:
         
         for directory in selected_directories:
             info = directory_info.get(directory, {})
-            files = info.get('files', [])
+            file_count = info.get('file_count', 0)
             
-            if files:
+            if file_count:
                 print(f"📁 {directory}/")
-                for filepath, size in files[:10]:  # Show first 10 files
-                    rel_path = os.path.relpath(filepath, directory)
+                relpath = _relpath_from(directory)
+                for filepath, size in info['sample']:  # Show first files from the scan
+                    rel_path = relpath(filepath)
                     print(f"   🗑️  {rel_path} ({self.format_size(size)})")
                 
-                if len(files) > 10:
-                    remaining = len(files) - 10
+                if file_count > PREVIEW_SAMPLE_SIZE:
+                    remaining = file_count - PREVIEW_SAMPLE_SIZE
                     print(f"   ... and {remaining} more files")
                 
-                total_preview_files += len(files)
-                total_preview_size += sum(size for _, size in files)
+                total_preview_files += file_count
+                total_preview_size += info.get('total_size', 0)
                 print()
         
         print("=" * 60)
@@ -648,31 +1312,56 @@ class CleanupUtility:
         
         for directory in selected_directories:
             info = directory_info.get(directory, {})
-            files = info.get('files', [])
+            file_count = info.get('file_count', 0)
             
-            if files:
-                print(f"🧹 Cleaning {directory}/ ({len(files)} files)...")
+            if file_count and not self.backup_dir:
+                print(f"🧹 Cleaning {directory}/ ({file_count} files)...")
                 
-                for filepath, size in files:
+                # Whole tree is selected: remove its contents in one pass, keeping the root
+                deleted_files, deleted_size = file_count, info.get('total_size', 0)
+                for path, error in _clear_directory(directory):
+                    print(f"⚠️  Failed to delete {path}: {error}")
                     try:
-                        os.remove(filepath)
-                        self.deleted_files += 1
-                        self.deleted_size += size
-                        
-                        # Progress indicator for large operations
-                        if self.deleted_files % 50 == 0:
-                            print(f"   ⏳ Deleted {self.deleted_files} files...")
-                            
-                    except (OSError, FileNotFoundError) as e:
-                        print(f"⚠️  Failed to delete {filepath}: {e}")
+                        st = os.stat(path, follow_symlinks=False)
+                    except OSError:
+                        continue
+                    # A file that is still there was counted by the scan but not deleted
+                    if not stat.S_ISDIR(st.st_mode):
+                        deleted_files -= 1
+                        deleted_size -= st.st_size
+                self.deleted_files += deleted_files
+                self.deleted_size += deleted_size
+            
+            elif file_count:
+                print(f"🧹 Cleaning {directory}/ ({file_count} files)...")
                 
-                # Clean up empty directories
-                try:
-                    for root, dirs, files in os.walk(directory, topdown=False):
-                        if not files and not dirs:
-                            os.rmdir(root)
-                except OSError:
-                    pass  # Directory not empty or permission error
+                # Backup taken: delete only the files that were copied, file by file so
+                # failures and totals are reported per file, with progress as one
+                # status line rewritten in place
+                show_progress = file_count > UNLINK_BATCH_SIZE
+                
+                def report_failure(filepath, error):
+                    print(f"\r⚠️  Failed to delete {filepath}: {error}\033[K")
+                
+                def report_progress(done_files, done_size, offset=(self.deleted_files, self.deleted_size)):
+                    if show_progress:
+                        sys.stdout.write(f"\r   ⏳ Deleted {offset[0] + done_files} files "
+                                         f"({self.format_size(offset[1] + done_size)})...")
+                        sys.stdout.flush()
+                
+                copied = self.backed_up.get(directory, frozenset())
+                if _FWALK_DIR_FD:
+                    deleted_files, deleted_size = _fwalk_delete(directory, report_failure, report_progress, copied)
+                else:
+                    deleted_files, deleted_size = _batched_delete(
+                        lambda dirs=None, files=info['iter_files']: (item for item in files(dirs) if item[0] in copied),
+                        report_failure, report_progress, keep=directory
+                    )
+                self.deleted_files += deleted_files
+                self.deleted_size += deleted_size
+                
+                if show_progress:
+                    sys.stdout.write("\n")
         
         print(f"✅ Cleanup complete! Deleted {self.deleted_files} files ({self.format_size(self.deleted_size)})")
     
@@ -708,6 +1397,32 @@ class CleanupUtility:
         
         return response == 'DELETE'
     
+    def _auto_select(self, directory_info):
+        """Select every directory that has files."""
+        return [directory for directory, info in directory_info.items() if info['file_count'] > 0]
+    
+    def _execute(self, selected_directories, directory_info, preview_only=False, create_backup=False, confirm=True):
+        """Shared post-selection flow: preview, optional confirmation, optional backup, delete."""
+        has_files = self.preview_cleanup(selected_directories, directory_info)
+        if preview_only or not has_files:
+            return
+        
+        # Confirm deletion
+        if confirm and not self.confirm_deletion(selected_directories, directory_info):
+            print("🚫 Cleanup cancelled.")
+            return
+        
+        # Create backup if requested
+        if create_backup:
+            self.create_backup(selected_directories, directory_info)
+        
+        # Delete files
+        self.delete_files(selected_directories, directory_info)
+        
+        # Final summary
+        if self.backup_dir:
+            print(f"💾 Backup available in: {self.backup_dir}")
+    
     def run_interactive(self, preview_only=False, create_backup=False):
         """Run the utility in interactive mode."""
         print("🧹 Documents Processor Cleanup Utility")
@@ -726,31 +1441,7 @@ class CleanupUtility:
             print("ℹ️  No directories selected for cleanup.")
             return
         
-        # Preview mode
-        if preview_only:
-            self.preview_cleanup(selected_directories, directory_info)
-            return
-        
-        # Show preview
-        has_files = self.preview_cleanup(selected_directories, directory_info)
-        if not has_files:
-            return
-        
-        # Confirm deletion
-        if not self.confirm_deletion(selected_directories, directory_info):
-            print("🚫 Cleanup cancelled.")
-            return
-        
-        # Create backup if requested
-        if create_backup:
-            self.create_backup(selected_directories, directory_info)
-        
-        # Delete files
-        self.delete_files(selected_directories, directory_info)
-        
-        # Final summary
-        if self.backup_dir:
-            print(f"💾 Backup available in: {self.backup_dir}")
+        self._execute(selected_directories, directory_info, preview_only, create_backup, confirm=True)
     
     def run_automatic(self, preview_only=False, create_backup=False):
         """Run the utility in automatic mode (clean all directories)."""
@@ -764,38 +1455,17 @@ class CleanupUtility:
             return
         
         # Select all directories with files
-        selected_directories = []
-        for directory, info in directory_info.items():
-            if info['file_count'] > 0:
-                selected_directories.append(directory)
+        selected_directories = self._auto_select(directory_info)
         
         if not selected_directories:
             print("ℹ️  No files found to clean.")
             return
         
-        # Preview
         print("🎯 Automatic cleanup mode - all directories with files will be cleaned:")
-        has_files = self.preview_cleanup(selected_directories, directory_info)
-        
-        if preview_only:
-            return
-        
-        if not has_files:
-            return
-        
-        # Create backup if requested
-        if create_backup:
-            self.create_backup(selected_directories, directory_info)
-        
-        # Delete files
-        self.delete_files(selected_directories, directory_info)
-        
-        # Final summary
-        if self.backup_dir:
-            print(f"💾 Backup available in: {self.backup_dir}")
+        self._execute(selected_directories, directory_info, preview_only, create_backup, confirm=False)
 
-def main():
-    """Main entry point for the cleanup utility."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
     parser = argparse.ArgumentParser(
         description="Documents Processor Cleanup Utility - Clean temporary processing files",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -864,7 +1534,14 @@ Programmatic Usage:
         help='Interactive mode (default behavior)'
     )
     
-    args = parser.parse_args()
+    return parser
+
+# Built once at import and reused by main()
+_PARSER = _build_parser()
+
+def main():
+    """Main entry point for the cleanup utility."""
+    args = _PARSER.parse_args()
     
     # Create cleanup utility instance
     utility = CleanupUtility()
@@ -887,6 +1564,8 @@ Programmatic Usage:
     except Exception as e:
         print(f"\n❌ Error during cleanup: {e}")
         sys.exit(1)
+    finally:
+        utility.close()
 
 if __name__ == "__main__":
     main()
@@ -4,43 +4,53 @@ Universal document processor extracting text and images from various formats.
 Now aligned with local 'document_processor_rar_zip.py':
 - Optional direct Excel processing via ENABLE_DIRECT_EXCEL (default: off)
 - Safe Excel utilities for .xlsx/.xls
-- PDF page preview at dpi=200, with unique image filenames
+- PDF page preview at dpi=200 (max 1500 px, JPEG), with unique image filenames
 - AI Vision orientation fix before description
 """
 
 import os
 import io
+import itertools
 import logging
+import re
 import shutil
 import base64
 import zipfile
-# Optional dependency for .rar support
-try:
-    import rarfile  # needs `pip install rarfile` and unrar/bsdtar on system
-except ImportError:
-    rarfile = None
+import struct
+from xml.parsers import expat
+import hashlib
+import mmap
+import queue
+import threading
 import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
 from pathlib import Path
 import json
 import email
 from email import policy
 from email.parser import BytesParser
-# Optional HTML->text conversion
+# Optional HTML->text conversion: selectolax (lexbor C parser) first, then BeautifulSoup
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser  # type: ignore
+except Exception:
+    HTMLParser = None  # type: ignore
 try:
     from bs4 import BeautifulSoup  # type: ignore
 except Exception:
     BeautifulSoup = None  # type: ignore
 
 import fitz  # PyMuPDF
-import pandas as pd
 from PIL import Image, ExifTags
 from PIL import ImageOps  # ← for auto-rotating images by EXIF
 from striprtf.striprtf import rtf_to_text
 import strip_markdown
 import openpyxl
 from functools import lru_cache
+from collections import OrderedDict
 from dotenv import load_dotenv
 
 # Legacy .xls optional support
@@ -50,7 +60,50 @@ try:
 except ImportError:
     XLRD_AVAILABLE = False
 
-from openai import OpenAI   # ⬅️ new-style SDK (≥ 1.0.0)  ✅
+if TYPE_CHECKING:
+    import pandas as pd
+    from openai import OpenAI
+
+
+# Heavy backends needed by only a few handlers are imported on first use, so
+# batch and PDF worker processes that never touch them start faster
+@lru_cache(maxsize=None)
+def _pandas():
+    import pandas
+    return pandas
+
+
+@lru_cache(maxsize=None)
+def _docx():
+    """python-docx package, or None when it isn't installed."""
+    try:
+        import docx
+        import docx.table
+    except ImportError:
+        return None
+    return docx
+
+
+@lru_cache(maxsize=None)
+def _pptx():
+    """python-pptx package, or None when it isn't installed."""
+    try:
+        import pptx
+        import pptx.shapes.picture
+    except ImportError:
+        return None
+    return pptx
+
+
+@lru_cache(maxsize=None)
+def _rarfile():
+    """rarfile module, or None when it isn't installed (needs unrar/bsdtar on system)."""
+    try:
+        import rarfile
+    except ImportError:
+        return None
+    return rarfile
+
 
 class LLMConfig:
     """Small standalone adapter for chat-completion calls."""
@@ -75,8 +128,7 @@ class LLMConfig:
             kwargs["temperature"] = temperature
         if timeout is not None:
             kwargs["timeout"] = timeout
-        client = OpenAI(api_key=_get_api_key())
-        completion = client.chat.completions.create(**kwargs)
+        completion = _get_openai_client().chat.completions.create(**kwargs)
         return completion.choices[0].message.content or ""
 
 # Optional dependency for Apple Numbers (.numbers)
@@ -126,19 +178,42 @@ MIN_IMG_PIXELS = 200 * 200
 MAX_VISION_CALLS_PER_PAGE = 50
 MAX_IMAGE_DIM = 3000
 MAX_IMAGE_SIZE = 10 * 1024 * 1024
-
-SUPPORTED_IMAGE_FORMATS = {".jpg", ".jpeg", ".png", ".heic", ".heif", ".gif", ".tiff", ".tif", ".bmp"}
+# zlib level for PNGs we write; they only feed Vision, so favour encode speed over size
+PNG_COMPRESS_LEVEL = 1
+# Images larger than this are downscaled before being base64-encoded for Vision
+VISION_MAX_PAYLOAD_BYTES = 4 * 1024 * 1024
+# Worker processes for per-page PDF extraction and preview rendering (DOCS_PDF_WORKERS)
+PDF_PAGE_WORKERS = min(os.cpu_count() or 1, 4)
+# Rendered PDF page previews: resolution, long-edge cap in pixels, JPEG quality
+PDF_PREVIEW_DPI = 200
+PDF_PREVIEW_MAX_DIM = 1500
+PDF_PREVIEW_JPEG_QUALITY = 75
+# PDFs up to this many pages are extracted in threads, where process startup would dominate
+PDF_THREAD_MAX_PAGES = 8
+# Concurrent Vision requests per process, shared by all documents and archive members
+VISION_CONCURRENCY = 10
+# Threads processing extracted ZIP/RAR members
+ARCHIVE_WORKERS = 4
+
+SUPPORTED_IMAGE_FORMATS = frozenset({".jpg", ".jpeg", ".png", ".heic", ".heif", ".gif", ".tiff", ".tif", ".bmp"})
 
 # Compact preview and heuristic thresholds
 CSV_PREVIEW_CHARS = 1000
 HTML_IMAGE_HEURISTIC_BYTES = 10000
 
 # Allowed extensions inside archives (ZIP/RAR)
-ARCHIVE_ALLOWED_EXTS = SUPPORTED_IMAGE_FORMATS | {
+ARCHIVE_ALLOWED_EXTS = SUPPORTED_IMAGE_FORMATS | frozenset({
     ".pdf", ".txt", ".pages", ".numbers", ".xlsx", ".xls", ".csv", ".json", ".py",
     ".html", ".cms", ".css", ".eml", ".mbox", ".rtf", ".md", ".markdown", ".odt",
     ".epub", ".docx", ".doc", ".pptx", ".ppt", ".pkpass"
-}
+})
+
+# Office formats converted to PDF with LibreOffice
+OFFICE_CONVERT_EXTS = frozenset({".docx", ".doc", ".pptx", ".ppt", ".xls", ".xlsx"})
+# Spreadsheets are read directly instead when ENABLE_DIRECT_EXCEL is on
+EXCEL_EXTS = frozenset({".xlsx", ".xls"})
+# Embedded .docx/.pptx images sent to Vision (its payload is declared as PNG or JPEG)
+OFFICE_IMAGE_EXTS = frozenset({".png", ".jpg", ".jpeg"})
 
 # ----------------------------------------------------------------------
 # ZIP/RAR limits
@@ -149,6 +224,17 @@ MAX_RAR_SIZE = 100 * 1024 * 1024
 MAX_RAR_FILES = 50
 # Per-member extraction limit to avoid oversized entries; set generously
 MAX_ARCHIVE_MEMBER_SIZE = 100 * 1024 * 1024
+# Members expanding more than this ratio are treated as zip bombs (checked above MIN_BOMB_CHECK_SIZE)
+MAX_ARCHIVE_COMPRESSION_RATIO = 100
+MIN_BOMB_CHECK_SIZE = 1024 * 1024
+# Text-like, CSV and email members up to this size are handed to the child Document
+# in memory instead of being written to the extraction folder and read back
+ARCHIVE_IN_MEMORY_EXTS = frozenset({
+    ".txt", ".json", ".py", ".html", ".cms", ".css", ".rtf", ".md", ".markdown", ".csv", ".eml", ".mbox"
+})
+ARCHIVE_IN_MEMORY_MAX_SIZE = 8 * 1024 * 1024
+# Chunk size for copying archive members to disk
+_COPY_BUF_SIZE = 1 << 20
 
 # ----------------------------------------------------------------------
 # PKPASS limits
@@ -168,6 +254,11 @@ DISABLE_PAGE_LIMIT_ENV_VAR = "DISABLE_PAGE_LIMIT"
 # Excel direct-processing toggle (default: disabled)
 # ----------------------------------------------------------------------
 EXCEL_DIRECT_ENV_VAR = "ENABLE_DIRECT_EXCEL"
+# Markdown copies of table previews (default: disabled, CSV previews only)
+TABLE_MARKDOWN_ENV_VAR = "ENABLE_TABLE_MARKDOWN"
+# Read .docx/.pptx with python-docx/python-pptx instead of converting them to PDF
+# (default: disabled; also used when LibreOffice is missing)
+OFFICE_DIRECT_ENV_VAR = "ENABLE_DIRECT_OFFICE"
 
 ###############################################################################
 # Logging configuration
@@ -182,19 +273,51 @@ logger.addHandler(logging.NullHandler())
 # Vision models
 ##############################################################################
 
+# .env is read once here; helpers below only consult os.environ
 load_dotenv()
 DOCS_VISION_MODEL = os.getenv("DOCS_VISION_MODEL", "gpt-4o-2024-08-06")
 DOCS_VISION_MODEL_ROTATE = os.getenv("DOCS_VISION_MODEL_ROTATE", "gpt-4o-2024-08-06")
 
+# Default request timeout (seconds) for the shared OpenAI client
+OPENAI_TIMEOUT = 180
+
+# Persistent cache of image descriptions keyed by image content; kept outside
+# processing_cache so cleanup before batch runs doesn't drop it
+VISION_CACHE_DIR = os.getenv("DOCS_VISION_CACHE_DIR", os.path.join("processed_documents", "vision_cache"))
+# Descriptions also kept in memory, least recently used dropped first
+VISION_MEMORY_CACHE_SIZE = 1024
+# Persistent cache of whole-document results keyed by file content and settings;
+# an empty value disables it. Entries whose images/tables are gone are ignored.
+DOC_CACHE_DIR = os.getenv("DOCS_DOC_CACHE_DIR", os.path.join("processed_documents", "doc_cache"))
+# Metadata set by _inject_basic_metadata, which describes the file rather than its content
+_FILE_STAT_KEYS = frozenset({"modified_time", "created_time", "size_bytes"})
+# Override for PDF_PAGE_WORKERS (page extraction and preview rendering); 1 keeps PDFs in-process
+PDF_WORKERS_ENV_VAR = "DOCS_PDF_WORKERS"
+try:
+    PDF_PAGE_WORKERS = max(1, int(os.getenv(PDF_WORKERS_ENV_VAR, "") or PDF_PAGE_WORKERS))
+except ValueError:
+    logger.warning("Invalid %s, using %d", PDF_WORKERS_ENV_VAR, PDF_PAGE_WORKERS)
+
 ###############################################################################
 # Helper utilities
 ###############################################################################
 
 
+# Compiled once; used for every file name and HTML fallback
+_TRAILING_NON_ALNUM_RE = re.compile(r"[\W_]+\Z")
+_BR_TAG_RE = re.compile(r"<\s*br\s*/?\s*>", re.I)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
 def _safe_name(s: str) -> str:
     return "".join(c for c in s if c.isalnum() or c in ("_", "-"))
 
 
+def _file_ext(file_name: str) -> str:
+    """Lower-cased extension with trailing non-alnum chars stripped (e.g. '}.eml}' -> '.eml')."""
+    return _TRAILING_NON_ALNUM_RE.sub("", os.path.splitext(file_name)[1].lower())
+
+
 def _decode_mime_words(value: Optional[str]) -> str:
     if not value:
         return ""
@@ -215,6 +338,12 @@ def _decode_mime_words(value: Optional[str]) -> str:
 
 
 def _html_to_text(html: str) -> str:
+    try:
+        if HTMLParser is not None:
+            root = HTMLParser(html).root
+            return (root.text(separator="\n") if root is not None else "").strip()
+    except Exception:
+        pass
     try:
         if BeautifulSoup is not None:
             soup = BeautifulSoup(html, "html.parser")
@@ -222,22 +351,24 @@ def _html_to_text(html: str) -> str:
     except Exception:
         pass
     # Fallback: naive strip tags
-    import re
-    text = re.sub(r"<\s*br\s*/?\s*>", "\n", html, flags=re.I)
-    text = re.sub(r"<[^>]+>", "", text)
+    text = _BR_TAG_RE.sub("\n", html)
+    text = _TAG_RE.sub("", text)
     return text.strip()
 
 
+_image_name_counter = itertools.count(1)
+
+
 def _generate_unique_image_name(source_type: str, original_name: str, extension: str) -> str:
     """
     Generate unique image filename to prevent conflicts across different processing types.
-    {source_type}_{timestamp}_{counter}_{original_name}.{extension}
+    {source_type}_{timestamp}_{pid}_{counter}_{original_name}.{extension}
     """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    counter = getattr(_generate_unique_image_name, 'counter', 0) + 1
-    _generate_unique_image_name.counter = counter
+    counter = next(_image_name_counter)  # atomic, archive members are processed in threads
     clean_name = _safe_name(original_name).rstrip()
-    return f"{source_type}_{timestamp}_{counter:03d}_{clean_name}.{extension}"
+    # Batch workers are forked with the same counter value, so the pid keeps their names apart
+    return f"{source_type}_{timestamp}_{os.getpid()}_{counter:03d}_{clean_name}.{extension}"
 
 
 def _ensure_dirs() -> None:
@@ -252,10 +383,100 @@ def _save_binary(content: bytes, dest_path: str) -> None:
         f.write(content)
 
 
+# Reusable scratch buffers, so copying and hashing many files doesn't allocate 1 MB per file
+_copy_buffers: "queue.SimpleQueue[bytearray]" = queue.SimpleQueue()
+
+
+@contextmanager
+def _scratch_buffer():
+    """Borrow a _COPY_BUF_SIZE bytearray from the pool and return it afterwards."""
+    try:
+        buf = _copy_buffers.get_nowait()
+    except queue.Empty:
+        buf = bytearray(_COPY_BUF_SIZE)
+    try:
+        yield buf
+    finally:
+        _copy_buffers.put(buf)
+
+
+def _copy_stream(src, dst) -> None:
+    """Copy src to dst through a pooled buffer using readinto (falls back to copyfileobj)."""
+    if not hasattr(src, "readinto"):
+        shutil.copyfileobj(src, dst, length=_COPY_BUF_SIZE)
+        return
+    with _scratch_buffer() as buf, memoryview(buf) as view:
+        while True:
+            n = src.readinto(buf)
+            if not n:
+                break
+            dst.write(view[:n])
+
+
+def _downscale_for_vision(data, fmt: str) -> bytes:
+    """Re-encode an oversized image within MAX_IMAGE_DIM for the Vision payload; the saved file is untouched."""
+    img = Image.open(io.BytesIO(data))
+    img.thumbnail((MAX_IMAGE_DIM, MAX_IMAGE_DIM))
+    if fmt == "JPEG" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    out = io.BytesIO()
+    img.save(out, format=fmt, quality=90, compress_level=PNG_COMPRESS_LEVEL)
+    return out.getvalue()
+
+
+def _extract_zip_member(z: zipfile.ZipFile, info: zipfile.ZipInfo, dest_path: str) -> None:
+    """
+    Write one ZIP member to dest_path. Large uncompressed (stored) members are
+    copied kernel-side with os.sendfile straight from the archive file; everything
+    else is decompressed through _copy_stream.
+    """
+    if (info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1
+            and info.file_size >= _COPY_BUF_SIZE and hasattr(os, "sendfile") and z.filename):
+        try:
+            with open(z.filename, "rb") as src, open(dest_path, "wb") as dst:
+                # Data follows the 30-byte local header plus its name and extra fields
+                src.seek(info.header_offset + 26)
+                name_len, extra_len = struct.unpack("<HH", src.read(4))
+                offset = info.header_offset + 30 + name_len + extra_len
+                remaining = info.file_size
+                while remaining:
+                    sent = os.sendfile(dst.fileno(), src.fileno(), offset, remaining)
+                    if not sent:
+                        raise OSError("unexpected end of archive")
+                    offset += sent
+                    remaining -= sent
+            return
+        except OSError as e:
+            logger.debug("sendfile extraction of %s failed, copying instead: %s", info.filename, e)
+    with z.open(info) as src, open(dest_path, "wb") as dst:
+        _copy_stream(src, dst)
+
+
+@contextmanager
+def _image_buffer(image_path: str, image_bytes: Optional[bytes] = None):
+    """
+    Yield image content as a bytes-like object: image_bytes when given, otherwise
+    a read-only mmap of the file, so hashing and base64 need no extra copy.
+    """
+    if image_bytes is not None:
+        yield image_bytes
+        return
+    with open(image_path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file can't be mapped
+            yield b""
+            return
+        try:
+            yield mm
+        finally:
+            mm.close()
+
+
 def _save_image_data(data, dest_path: str) -> None:
     os.makedirs(os.path.dirname(dest_path), exist_ok=True)
     if hasattr(data, "save") and callable(getattr(data, "save")):
-        data.save(dest_path)
+        data.save(dest_path, compress_level=PNG_COMPRESS_LEVEL)
     else:
         with open(dest_path, "wb") as f:
             f.write(data)
@@ -290,10 +511,7 @@ def _safe_join_path(root: str, arcname: str) -> str:
         else:
             safe = _safe_name(part)
         parts.append(safe)
-    path = os.path.join(root, *parts) if parts else root
-    # Ensure directory exists
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    return path
+    return os.path.join(root, *parts) if parts else root
 
 
 def _find_soffice() -> str:
@@ -311,9 +529,56 @@ def _find_soffice() -> str:
     return ""
 
 
+def _soffice_command(soffice: str, out_dir: str, paths: List[str]) -> List[str]:
+    """
+    soffice PDF conversion command with a user profile private to this process
+    and thread: concurrent LibreOffice runs on one profile exit without converting.
+    """
+    profile = os.path.join(tempfile.gettempdir(), f"lo_profile_{os.getpid()}_{threading.get_ident()}")
+    return [soffice, f"-env:UserInstallation={Path(profile).as_uri()}",
+            "--headless", "--convert-to", "pdf", "--outdir", out_dir, *paths]
+
+
+def _convert_to_pdf_batch(paths: List[str], timeout: int = 120) -> Dict[str, str]:
+    """
+    Convert several documents to PDF with one soffice run per directory, so
+    LibreOffice starts once instead of once per file. Files whose PDF names
+    would collide are left out. Returns {source path: pdf path} for the files
+    converted; callers fall back to per-file conversion for the rest.
+    """
+    soffice = _find_soffice()
+    if not soffice:
+        return {}
+    groups: Dict[Tuple[str, str], List[str]] = {}
+    for path in paths:
+        out_dir, base = os.path.split(path)
+        groups.setdefault((out_dir, os.path.splitext(base)[0]), []).append(path)
+    batches: Dict[str, List[str]] = {}
+    for (out_dir, _), group in groups.items():
+        if len(group) == 1:
+            batches.setdefault(out_dir, []).append(group[0])
+    converted: Dict[str, str] = {}
+    for out_dir, batch in batches.items():
+        try:
+            subprocess.run(
+                _soffice_command(soffice, out_dir, batch),
+                check=True,
+                timeout=timeout * len(batch),
+                capture_output=True
+            )
+        except (subprocess.SubprocessError, OSError) as e:
+            logger.warning("Batch LibreOffice conversion failed in %s: %s", out_dir, e)
+            continue
+        for path in batch:
+            pdf_path = os.path.splitext(path)[0] + ".pdf"
+            if os.path.exists(pdf_path):
+                converted[path] = pdf_path
+        logger.debug("Converted %d documents to PDF in one LibreOffice run", len(batch))
+    return converted
+
+
 @lru_cache(maxsize=1)
 def _get_page_limit() -> Optional[int]:
-    load_dotenv()
     disable_limit = os.getenv(DISABLE_PAGE_LIMIT_ENV_VAR, "").lower()
     if disable_limit in ("true", "1", "yes", "on"):
         logger.info("Page limits disabled via %s", DISABLE_PAGE_LIMIT_ENV_VAR)
@@ -335,34 +600,219 @@ def _get_page_limit() -> Optional[int]:
 
 @lru_cache(maxsize=1)
 def _is_direct_excel_enabled() -> bool:
-    load_dotenv()
     flag = os.getenv(EXCEL_DIRECT_ENV_VAR, "").lower()
     return flag in ("true", "1", "yes", "on")
 
 
-def _csv_previews(df: pd.DataFrame, label: str, *, preview_chars: int = CSV_PREVIEW_CHARS) -> List[str]:
-    full_csv = df.to_csv(index=False)
-    md = df.to_markdown(index=False)
+@lru_cache(maxsize=1)
+def _is_table_markdown_enabled() -> bool:
+    flag = os.getenv(TABLE_MARKDOWN_ENV_VAR, "").lower()
+    return flag in ("true", "1", "yes", "on")
+
+
+@lru_cache(maxsize=1)
+def _is_direct_office_enabled() -> bool:
+    flag = os.getenv(OFFICE_DIRECT_ENV_VAR, "").lower()
+    return flag in ("true", "1", "yes", "on")
+
+
+def _can_read_office_directly(ext: str) -> bool:
+    """Whether the python-docx/python-pptx reader for ext is installed."""
+    loader = {".docx": _docx, ".pptx": _pptx}.get(ext)
+    return loader is not None and loader() is not None
+
+
+def _write_csv(df: "pd.DataFrame", csv_path: str) -> str:
+    """
+    Serialize df once, write it to csv_path and return the text. Same-named tables from
+    concurrent documents share csv_path, so callers use this text rather than reading the file back.
+    """
+    csv_text = df.to_csv(index=False)
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        f.write(csv_text)
+    return csv_text
+
+
+def _csv_previews(df: "pd.DataFrame", label: str, *, preview_chars: int = CSV_PREVIEW_CHARS,
+                  csv_text: Optional[str] = None) -> List[str]:
+    if csv_text is not None:
+        full_csv = csv_text
+    else:
+        # Every row adds at least a newline, so preview_chars + 1 rows are enough to fill the
+        # preview and tell whether it was truncated; the rest of the frame is never serialized
+        full_csv = df.head(preview_chars + 1).to_csv(index=False)
     head = full_csv[:preview_chars]
     tail = "..." if len(full_csv) > preview_chars else ""
-    return [
-        f"{label} (CSV):\n{head}{tail}\n",
-        f"{label} (Markdown):\n{md}\n",
-    ]
+    previews = [f"{label} (CSV):\n{head}{tail}\n"]
+    if _is_table_markdown_enabled():
+        previews.append(f"{label} (Markdown):\n{df.to_markdown(index=False)}\n")
+    return previews
+
+
+_VISION_PROMPT_HASH = hashlib.sha256(AI_IMAGE_DESCRIPTION_PROMPT.encode()).hexdigest()[:8]
+_vision_memory_cache: "OrderedDict[str, str]" = OrderedDict()
+_vision_memory_lock = threading.Lock()
+
+
+def _vision_cache_key(image_bytes: bytes, model: str) -> str:
+    return f"{_safe_name(model)}_{_VISION_PROMPT_HASH}_{hashlib.sha256(image_bytes).hexdigest()}"
+
+
+def _vision_memory_put(key: str, text: str) -> None:
+    with _vision_memory_lock:
+        _vision_memory_cache[key] = text
+        _vision_memory_cache.move_to_end(key)
+        if len(_vision_memory_cache) > VISION_MEMORY_CACHE_SIZE:
+            _vision_memory_cache.popitem(last=False)
+
+
+def _vision_cache_get(key: str) -> Optional[str]:
+    with _vision_memory_lock:
+        text = _vision_memory_cache.get(key)
+        if text is not None:
+            _vision_memory_cache.move_to_end(key)
+            return text
+    try:
+        with open(os.path.join(VISION_CACHE_DIR, f"{key}.txt"), "r", encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return None
+    _vision_memory_put(key, text)
+    return text
+
+
+def _vision_cache_set(key: str, text: str) -> None:
+    _vision_memory_put(key, text)
+    cache_path = os.path.join(VISION_CACHE_DIR, f"{key}.txt")
+    # Per-thread temp name: concurrent describers of identical bytes must not share it
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(VISION_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, cache_path)  # atomic: readers never see a partial entry
+    except OSError as e:
+        logger.warning("Failed to write Vision cache %s: %s", key, e)
+
+
+# Bump when handler output changes so stale document cache entries are not reused
+_DOC_CACHE_VERSION = 1
+
+
+def _fingerprint(path: str) -> str:
+    """SHA-256 of a file's content, read in _COPY_BUF_SIZE chunks."""
+    digest = hashlib.sha256()
+    with _scratch_buffer() as buf, memoryview(buf) as view, open(path, "rb") as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+
+def _doc_cache_key(fingerprint: str, file_ext: str, media_dir: str) -> str:
+    # The extension picks the handler, so identical bytes under another extension are a different entry
+    settings = json.dumps([
+        _DOC_CACHE_VERSION, file_ext, os.path.abspath(media_dir), _get_page_limit(), _is_direct_excel_enabled(),
+        _is_table_markdown_enabled(), _is_direct_office_enabled(), DOCS_VISION_MODEL, _VISION_PROMPT_HASH,
+    ])
+    return f"{fingerprint}_{hashlib.sha256(settings.encode()).hexdigest()[:8]}"
+
+
+def _doc_cache_get(key: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(DOC_CACHE_DIR, f"{key}.json"), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not all(os.path.exists(p) for p in entry.get("images", []) + entry.get("tables", [])):
+        return None
+    return entry
+
+
+def _doc_cache_set(key: str, entry: dict) -> None:
+    cache_path = os.path.join(DOC_CACHE_DIR, f"{key}.json")
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(DOC_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning("Failed to write document cache %s: %s", key, e)
 
 
 def _get_api_key() -> Optional[str]:
-    load_dotenv()
     return os.getenv("API_KEY") or os.getenv("OPENAI_API_KEY")
 
+
+_openai_client: Optional["OpenAI"] = None
+_openai_client_lock = threading.Lock()
+# Caps in-flight Vision requests across nested batches (archive members, PDF pages)
+_vision_slots = threading.BoundedSemaphore(VISION_CONCURRENCY)
+
+
+def _get_openai_client() -> "OpenAI":
+    """Shared OpenAI client, created on first use so its HTTP connection pool is reused."""
+    global _openai_client
+    if _openai_client is None:
+        with _openai_client_lock:
+            if _openai_client is None:
+                from openai import OpenAI   # new-style SDK (>= 1.0.0)
+                _openai_client = OpenAI(api_key=_get_api_key(), timeout=OPENAI_TIMEOUT, max_retries=2)
+    return _openai_client
+
 # --------------------------
 # Safe Excel utilities
 # --------------------------
 
+def _read_xlsx_sheet(file_path: str, sheet_name: str):
+    """Stream one .xlsx sheet into a DataFrame like pd.read_excel (first row as header)."""
+    pd = _pandas()
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name]
+        # Some writers store a wrong used range; read-only mode would trust it and cut rows or columns
+        sheet.reset_dimensions()
+        rows = list(sheet.iter_rows(values_only=True))
+        # Formatting can extend the sheet's used range; drop the empty rows it leaves at the end
+        while rows and all(v is None for v in rows[-1]):
+            rows.pop()
+        if not rows:
+            return pd.DataFrame()
+        # Without a stored range rows come back ragged; cut trailing empty cells and pad to the widest row
+        width = max(next((i + 1 for i in range(len(row) - 1, -1, -1) if row[i] is not None), 0) for row in rows)
+        header, *data = [tuple(row[:width]) + (None,) * (width - len(row)) for row in rows]
+        # Repeated names get the first free ".1", ".2", ... suffix, as in pd.read_excel
+        columns = [f"Unnamed: {i}" if name is None else name for i, name in enumerate(header)]
+        taken = set(columns)
+        counts = {}
+        for i, name in enumerate(columns):
+            count = counts.get(name, 0)
+            if count:
+                while f"{name}.{count}" in taken:
+                    count += 1
+                counts[name] = count + 1
+                columns[i] = f"{name}.{count}"
+                taken.add(columns[i])
+            else:
+                counts[name] = 1
+        return pd.DataFrame(data, columns=columns)
+    finally:
+        workbook.close()
+
+
 def read_excel_file_safe(file_path: str, sheet_name: Optional[str] = None):
+    pd = _pandas()
     file_ext = Path(file_path).suffix.lower()
     try:
         if file_ext == ".xlsx":
+            if sheet_name is not None:
+                try:
+                    return _read_xlsx_sheet(file_path, sheet_name)
+                except Exception as e:
+                    logger.debug("Streaming read of %s/%s failed: %s", file_path, sheet_name, e)
             try:
                 return pd.read_excel(file_path, sheet_name=sheet_name, engine="openpyxl")
             except Exception:
@@ -388,7 +838,31 @@ def read_excel_file_safe(file_path: str, sheet_name: Optional[str] = None):
         raise
 
 
+@contextmanager
+def open_excel_file_safe(file_path: str):
+    """
+    Yield a single pd.ExcelFile for reading every sheet, preferring the calamine
+    engine (pandas >= 2.2 with python-calamine) over openpyxl/xlrd.
+    Yields None when the workbook can't be opened this way.
+    """
+    pd = _pandas()
+    engines = ["calamine", "openpyxl" if Path(file_path).suffix.lower() == ".xlsx" else None]
+    xls = None
+    for engine in engines:
+        try:
+            xls = pd.ExcelFile(file_path, engine=engine)
+            break
+        except Exception as e:
+            logger.debug("ExcelFile(engine=%s) failed for %s: %s", engine, file_path, e)
+    try:
+        yield xls
+    finally:
+        if xls is not None:
+            xls.close()
+
+
 def get_excel_sheet_names(file_path: str) -> List[str]:
+    pd = _pandas()
     file_ext = Path(file_path).suffix.lower()
     try:
         if file_ext == ".xlsx":
@@ -412,14 +886,159 @@ def get_excel_sheet_names(file_path: str) -> List[str]:
         return []
 
 
+# --------------------------
+# PDF page extraction
+# --------------------------
+# Pages are extracted in worker processes; PyMuPDF objects can't be pickled, so
+# each worker opens its own copy of the PDF. Scripts driving Document on
+# platforms that spawn workers (macOS, Windows) need an `if __name__ == "__main__"` guard.
+
+_worker_pdf = None  # fitz.Document opened by _init_pdf_worker in each worker process
+
+
+def _init_pdf_worker(pdf_path: str) -> None:
+    global _worker_pdf
+    _worker_pdf = fitz.open(pdf_path)
+
+
+def _extract_pdf_page_in_worker(page_number: int) -> list:
+    return _extract_pdf_page(_worker_pdf, page_number)
+
+
+def _display_list_text(display_list) -> str:
+    """Plain text of a page's display list, as page.get_text("text") would return it."""
+    textpage = display_list.get_textpage(flags=fitz.TEXTFLAGS_TEXT)
+    if not hasattr(textpage, "extractText"):  # newer PyMuPDF hands back the raw MuPDF object
+        textpage = fitz.TextPage(textpage)
+    return textpage.extractText()
+
+
+def _extract_pdf_page(doc, page_number: int) -> list:
+    """
+    Extract one PDF page without touching disk or the Vision API.
+
+    Returns the page as a list of items in output order: plain strings, or dicts
+    for images still to be saved/described:
+    - {"kind": "page", "data", "ext", "text"} for a page rendered because of graphics
+      ("text" is the page text to append after the description, or None)
+    - {"kind": "image", "data", "ext", "index", "describe", "xref"} for embedded raster images
+    - {"kind": "error", "message"} when rendering the page failed
+    """
+    page = doc[page_number]
+    items: list = []
+    vision_calls = 0
+    image_counter = 1
+    # The content stream is interpreted once into a display list, which serves both the
+    # text and, for graphics pages, the preview render. Plain text plus the image list
+    # is all we need; the "dict" mode would build a nested dict for every span
+    display_list = page.get_displaylist()
+    text = _display_list_text(display_list)
+    # Images actually drawn on the page, including inline ones get_images() misses;
+    # get_image_info() reports their sizes without base64-encoding them like get_text("html")
+    image_info = page.get_image_info(xrefs=True)
+    # get_images() lists the page's resources, which pages often share; keep those drawn here
+    shown_xrefs = {info["xref"] for info in image_info if info.get("xref")}
+    images = [image for image in page.get_images(full=True) if image[0] in shown_xrefs]
+    has_text = bool(text.strip())
+    has_images = bool(images)
+    drawings_present = page.get_drawings()
+    has_shown_images = False
+    if not drawings_present and not (has_images and not has_text):
+        shown_bytes = sum(info.get("size", 0) for info in image_info)
+        has_shown_images = shown_bytes > HTML_IMAGE_HEURISTIC_BYTES
+    if drawings_present or (has_images and not has_text) or has_shown_images:
+        logger.debug("Page %d has graphics (drawings=%s, only_images=%s, shown_images=%s)",
+                     page_number + 1, bool(drawings_present), bool(has_images and not has_text), has_shown_images)
+        try:
+            # Render straight at the preview size: 200 dpi, capped at PDF_PREVIEW_MAX_DIM on the long edge
+            rect = page.rect
+            zoom = min(PDF_PREVIEW_DPI / 72, PDF_PREVIEW_MAX_DIM / max(rect.width, rect.height, 1))
+            pix = display_list.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            # Page previews only feed Vision; JPEG encodes faster and is far smaller than PNG
+            items.append({"kind": "page", "data": pix.tobytes("jpeg", jpg_quality=PDF_PREVIEW_JPEG_QUALITY), "ext": "jpg",
+                          "text": [text] if has_text else None})
+        except Exception as e:
+            items.append({"kind": "error", "message": str(e)})
+    else:
+        logger.debug("Processing page %d: regular text + embedded raster images", page_number + 1)
+        items.append(f"========[Page {page_number + 1} regular text + embedded raster images]=======\n")
+        if not has_text and not has_images:
+            logger.debug("No text or images found on page %d", page_number + 1)
+        if text:
+            items.append(text)
+        for xref, *_ in images:
+            items.append(f"========[Image {image_counter}]========\n")
+            try:
+                info = doc.extract_image(xref)
+            except Exception as e:
+                logger.error("Image extraction error p.%s xref %s: %s", page_number + 1, xref, e)
+                continue
+            if not info or info.get("width", 0) * info.get("height", 0) < MIN_IMG_PIXELS:
+                continue
+            describe = vision_calls < MAX_VISION_CALLS_PER_PAGE
+            if describe:
+                vision_calls += 1
+            items.append({"kind": "image", "data": info["image"], "ext": info.get("ext", "png"),
+                          "index": image_counter, "describe": describe, "xref": xref})
+            image_counter += 1
+    items.append("\n---\n")
+    return items
+
+
 ###############################################################################
 # Document class
 ###############################################################################
 class Document:
-    _IMAGE_EXTS = SUPPORTED_IMAGE_FORMATS
-
-    def __init__(self, file_path: str, *, media_dir: str = "media_for_processing") -> None:
+    # Fixed attribute set: no per-instance __dict__ for the many children an archive creates
+    __slots__ = (
+        "media_dir", "_data", "images_dir", "tables_dir", "logs_dir", "file_path", "file_name", "file_ext",
+        "file_size", "metadata", "_text_parts", "tables", "images", "_cacheable", "_converted_pdf",
+    )
+    # Extension -> handler method name; built once rather than on every process() call
+    _HANDLERS = {
+        ".pdf": "_process_pdf",
+        ".pkpass": "_process_pkpass",
+        ".txt": "_process_txt",
+        ".pages": "_process_pages",
+        ".numbers": "_process_numbers",
+        # spreadsheet handler guarded by env toggle
+        # ".xlsx": "_process_spreadsheet",
+        # ".xls": "_process_spreadsheet",
+        ".csv": "_process_csv",
+        ".json": "_process_generic_text",
+        ".py": "_process_generic_text",
+        ".html": "_process_generic_text",
+        ".cms": "_process_generic_text",
+        ".css": "_process_generic_text",
+        ".eml": "_process_email",
+        ".mbox": "_process_email",
+        ".rtf": "_process_rtf",
+        ".md": "_process_markdown",
+        ".markdown": "_process_markdown",
+        ".odt": "_process_odt",
+        ".epub": "_process_epub",
+        ".zip": "_process_generic_zip",
+        ".rar": "_process_generic_rar",
+        **dict.fromkeys(SUPPORTED_IMAGE_FORMATS, "_process_image"),
+    }
+    # Handlers for ENABLE_DIRECT_OFFICE, used instead of the PDF conversion
+    _DIRECT_OFFICE_HANDLERS = {
+        ".docx": "_process_docx",
+        ".pptx": "_process_pptx",
+    }
+
+    @classmethod
+    def supports(cls, ext: str) -> bool:
+        """Whether process() has a handler for this (normalized) extension."""
+        return ext in cls._HANDLERS or ext in OFFICE_CONVERT_EXTS
+
+    def __init__(self, file_path: str, *, media_dir: str = "media_for_processing", data: Optional[bytes] = None) -> None:
+        """
+        data: content of a small file (ARCHIVE_IN_MEMORY_EXTS) that was never
+        written to disk; file_path then only supplies the name and extension.
+        """
         self.media_dir = media_dir
+        self._data = data
         os.makedirs(self.media_dir, exist_ok=True)
         # Per-task subfolders to isolate artifacts
         self.images_dir = os.path.join(self.media_dir, "images")
@@ -437,68 +1056,103 @@ class Document:
         else:
             self.file_path = file_path
         self.file_name = os.path.basename(self.file_path)
-        self.file_ext = os.path.splitext(self.file_name)[1].lower()
-        # Normalize extension to strip trailing non-alnum chars like '}.eml' case
-        if self.file_ext and not self.file_ext[-1].isalnum():
-            # remove trailing non-alnum characters
-            i = len(self.file_ext) - 1
-            while i >= 0 and not self.file_ext[i].isalnum():
-                i -= 1
-            self.file_ext = self.file_ext[:i+1]
-        self.file_size = os.path.getsize(self.file_path) if os.path.exists(self.file_path) else 0
+        self.file_ext = _file_ext(self.file_name)
+        if data is not None:
+            self.file_size = len(data)
+        else:
+            self.file_size = os.path.getsize(self.file_path) if os.path.exists(self.file_path) else 0
         self.metadata: Dict[str, str] = {}
-        self.text_content: str = ""
+        self._text_parts: List[str] = []  # joined lazily by the text_content property
         self.tables: List[str] = []
         self.images: List[str] = []
+        # Cleared when the result depends on something transient (failed Vision call,
+        # missing LibreOffice, failed child document) and must not be cached
+        self._cacheable = True
+        # PDF produced for this file by _convert_to_pdf_batch, if any
+        self._converted_pdf: Optional[str] = None
+
+    @property
+    def text_content(self) -> str:
+        if len(self._text_parts) > 1:
+            self._text_parts = ["".join(self._text_parts)]
+        return self._text_parts[0] if self._text_parts else ""
+
+    @text_content.setter
+    def text_content(self, value: str) -> None:
+        self._text_parts = [value]
+
+    def _append_text(self, text: str) -> None:
+        """Append to text_content without copying what was accumulated so far."""
+        self._text_parts.append(text)
 
     def process(self) -> None:
         if self.file_name.startswith("~$"):
             raise ValueError(f"Temporary file detected ('{self.file_name}'). Skipping processing.")
+        cache_key = None
+        if DOC_CACHE_DIR and self._data is not None:
+            cache_key = _doc_cache_key(hashlib.sha256(self._data).hexdigest(), self.file_ext, self.media_dir)
+        elif DOC_CACHE_DIR and os.path.isfile(self.file_path):
+            try:
+                cache_key = _doc_cache_key(_fingerprint(self.file_path), self.file_ext, self.media_dir)
+            except OSError as e:
+                logger.debug("Cannot fingerprint %s: %s", self.file_path, e)
+        if cache_key:
+            cached = _doc_cache_get(cache_key)
+            if cached is not None:
+                logger.info("Document cache hit for %s", self.file_name)
+                self.text_content = cached["text_content"]
+                self.images = cached["images"]
+                self.tables = cached["tables"]
+                # The key covers content only: identical files under other names share the
+                # entry, so file details come from this file and only content-derived fields are reused
+                self.metadata = {k: v for k, v in cached["metadata"].items() if k not in _FILE_STAT_KEYS}
+                if "size_bytes" in cached["metadata"]:
+                    self._inject_basic_metadata()
+                # Office files are converted to PDF; keep reporting the converted file
+                if cached["file_ext"] != self.file_ext:
+                    self.file_path, self.file_name, self.file_ext = cached["file_path"], cached["file_name"], cached["file_ext"]
+                return
+        self._process_uncached()
+        if cache_key and self._cacheable:
+            _doc_cache_set(cache_key, {
+                "text_content": self.text_content,
+                "images": self.images,
+                "tables": self.tables,
+                "metadata": self.metadata,
+                "file_path": self.file_path,
+                "file_name": self.file_name,
+                "file_ext": self.file_ext,
+            })
+
+    def _process_uncached(self) -> None:
         _ensure_dirs()
-        HANDLERS = {
-            ".pdf": self._process_pdf,
-            ".pkpass": self._process_pkpass,
-            ".txt": self._process_txt,
-            ".pages": self._process_pages,
-            ".numbers": self._process_numbers,
-            # spreadsheet handler guarded by env toggle
-            # ".xlsx": self._process_spreadsheet,
-            # ".xls": self._process_spreadsheet,
-            ".csv": self._process_csv,
-            ".json": self._process_generic_text,
-            ".py": self._process_generic_text,
-            ".html": self._process_generic_text,
-            ".cms": self._process_generic_text,
-            ".css": self._process_generic_text,
-            ".eml": self._process_email,
-            ".mbox": self._process_email,
-            ".rtf": self._process_rtf,
-            ".md": self._process_markdown,
-            ".markdown": self._process_markdown,
-            ".odt": self._process_odt,
-            ".epub": self._process_epub,
-            ".zip": self._process_generic_zip,
-            ".rar": self._process_generic_rar,
-        }
         ext = self.file_ext
-        if ext in self._IMAGE_EXTS:
-            handler = self._process_image
-        elif ext in {".xlsx", ".xls"} and _is_direct_excel_enabled():
+        if ext in EXCEL_EXTS and _is_direct_excel_enabled():
             handler = self._process_spreadsheet
-        elif ext in {".docx", ".doc", ".pptx", ".ppt", ".xls", ".xlsx"}:
+        elif _is_direct_office_enabled() and _can_read_office_directly(ext):
+            handler = getattr(self, self._DIRECT_OFFICE_HANDLERS[ext])
+        elif ext in OFFICE_CONVERT_EXTS:
             # Try to convert to PDF if libreoffice is available
             soffice = _find_soffice()
             if soffice:
-                pdf_path = self._convert_to_pdf(self.file_path)
+                # Archive members may already have been converted in one batch with their siblings
+                pdf_path = self._converted_pdf or self._convert_to_pdf(self.file_path)
                 self.file_path, self.file_name, self.file_ext = pdf_path, os.path.basename(pdf_path), ".pdf"
                 handler = self._process_pdf
+            elif _can_read_office_directly(ext):
+                logger.info("LibreOffice not found, reading %s directly", ext)
+                handler = getattr(self, self._DIRECT_OFFICE_HANDLERS[ext])
+                # Output depends on LibreOffice being absent, which the cache key doesn't capture
+                self._cacheable = False
             else:
                  # Fallback or skip
                  logger.warning("LibreOffice not found, skipping conversion for %s", ext)
                  self.text_content = f"(Skipped: LibreOffice not found for {ext})"
+                 self._cacheable = False
                  return
         else:
-            handler = HANDLERS.get(ext)
+            handler_name = self._HANDLERS.get(ext)
+            handler = getattr(self, handler_name) if handler_name else None
         if not handler:
             # raise ValueError(f"Unsupported file format: {ext}")
             logger.warning("Unsupported file format: %s", ext)
@@ -647,6 +1301,29 @@ class Document:
         self.text_content = "\n".join(lines).strip()
         self._inject_basic_metadata()
 
+    def _extract_pdf_pages_threaded(self, page_count: int) -> list:
+        """
+        Extract pages in a thread pool. PyMuPDF releases the GIL while rendering and
+        extracting text, but a fitz.Document is not thread-safe, so every thread
+        opens its own.
+        """
+        local = threading.local()
+        opened = []
+
+        def extract(page_number: int) -> list:
+            doc = getattr(local, "doc", None)
+            if doc is None:
+                doc = local.doc = fitz.open(self.file_path)
+                opened.append(doc)
+            return _extract_pdf_page(doc, page_number)
+
+        try:
+            with ThreadPoolExecutor(max_workers=min(PDF_PAGE_WORKERS, page_count)) as ex:
+                return list(ex.map(extract, range(page_count)))
+        finally:
+            for doc in opened:
+                doc.close()
+
     def _process_pdf(self) -> None:
         logger.info("Processing PDF document %s", self.file_path)
         doc = fitz.open(self.file_path)
@@ -658,84 +1335,217 @@ class Document:
         if page_limit and total_pages > page_limit:
             # Align with spreadsheets behavior: mark that page limit was applied
             self.metadata['page_limit_reached'] = True
-        for page_number in range(pages_to_process):
-            page = doc[page_number]
-            vision_calls = 0
-            image_counter = 1
-            page_dict = page.get_text("dict")
-            blocks = page_dict.get("blocks", [])
-            has_text = any(b.get("type") == 0 for b in blocks)
-            has_images = any(b.get("type") == 1 for b in blocks)
-            # Compute expensive HTML only if needed to disambiguate
-            drawings_present = page.get_drawings()
-            has_html_images = False
-            if not drawings_present and not (has_images and not has_text):
-                html_content = page.get_text("html")
-                has_html_images = ("<img" in html_content and "base64" in html_content and
-                                   len(html_content) > HTML_IMAGE_HEURISTIC_BYTES)
-            if drawings_present or (has_images and not has_text) or has_html_images:
-                logger.debug("Page %d has graphics (drawings=%s, only_images=%s, html_images=%s)",
-                             page_number + 1, bool(drawings_present), bool(has_images and not has_text), bool(has_html_images))
+        # Archive members run on pool threads: forking a page pool there could deadlock on locks
+        # held by sibling threads, and the members already run in parallel, so stay in-process
+        page_workers = PDF_PAGE_WORKERS if threading.current_thread() is threading.main_thread() else 1
+        # Extract pages in parallel, then save images and describe them in page order
+        if 1 < pages_to_process <= PDF_THREAD_MAX_PAGES and page_workers > 1:
+            pages = self._extract_pdf_pages_threaded(pages_to_process)
+        elif pages_to_process > 1 and page_workers > 1:
+            with ProcessPoolExecutor(max_workers=min(page_workers, pages_to_process),
+                                     initializer=_init_pdf_worker, initargs=(self.file_path,)) as ex:
+                pages = list(ex.map(_extract_pdf_page_in_worker, range(pages_to_process)))
+        else:
+            pages = [_extract_pdf_page(doc, n) for n in range(pages_to_process)]
+        doc.close()
+
+        stem = os.path.splitext(self.file_name)[0]
+        pending = []  # (index in parts, img_path, image bytes, text before description, text after description)
+        # Reused image XObjects (logos, headers) are saved and described once per document:
+        # xref -> (img_path, index in pending or None when the description was skipped)
+        seen_xrefs: Dict[int, Tuple[str, Optional[int]]] = {}
+        reused = []  # (index in parts, index in pending, text before description, text after description)
+        for page_number, items in enumerate(pages):
+            for item in items:
+                if isinstance(item, str):
+                    parts.append(item)
+                    continue
+                kind = item["kind"]
+                if kind == "error":
+                    logger.error("Pixmap error p.%s: %s", page_number + 1, item["message"])
+                    logger.debug("Error processing page %d image with graphics", page_number + 1)
+                    continue
+                if kind == "image" and item["xref"] in seen_xrefs:
+                    img_path, slot = seen_xrefs[item["xref"]]
+                    if slot is None and item["describe"]:
+                        slot = len(pending)
+                        seen_xrefs[item["xref"]] = (img_path, slot)
+                        pending.append((len(parts), img_path, item["data"], f"[Image {item['index']}: ", f"] (Image saved to: {img_path})"))
+                        parts.append("")
+                    elif slot is None:
+                        parts.append(f"[Image {item['index']}: (description skipped — Vision limit reached)] (Image saved to: {img_path})")
+                    else:
+                        reused.append((len(parts), slot, f"[Image {item['index']}: ", f"] (Image saved to: {img_path})"))
+                        parts.append("")
+                    continue
+                if kind == "page":
+                    base_name = f"{stem}_page{page_number + 1}"
+                else:
+                    base_name = f"{stem}_img{item['index']}"
+                unique_name = _generate_unique_image_name("pdf", base_name, item["ext"])
+                img_path = os.path.join(self.images_dir, unique_name)
                 try:
-                    pix = page.get_pixmap(dpi=200)
-                    unique_name = _generate_unique_image_name("pdf", f"{os.path.splitext(self.file_name)[0]}_page{page_number + 1}", "png")
-                    img_path = os.path.join(self.images_dir, unique_name)
-                    _save_image_data(pix, img_path)
-                    self.images.append(img_path)
-                    desc = self._generate_image_description(img_path)
-                    parts.append(f"[========[Page {page_number + 1} with graphics]======== \n {desc}]\n")
-                    logger.debug("Description for page %d with graphics added", page_number + 1)
-                    if has_text:
+                    _save_image_data(item["data"], img_path)
+                except Exception as e:
+                    logger.error("Save/describe image error: %s", e)
+                    continue
+                self.images.append(img_path)
+                if kind == "page":
+                    pending.append((len(parts), img_path, item["data"], f"[========[Page {page_number + 1} with graphics]======== \n ", "]\n"))
+                    parts.append("")
+                    if item["text"] is not None:
                         parts.append("========[Text extracted from graphics page]========\n")
-                        for block in blocks:
-                            if block.get("type") == 0:
-                                for line in block.get("lines", []):
-                                    for span in line.get("spans", []):
-                                        parts.append(span.get("text", ""))
+                        parts.extend(item["text"])
                         parts.append("\n")
-                except Exception as e:
-                    logger.error("Pixmap error p.%s: %s", page_number + 1, e)
-                    logger.debug("Error processing page %d image with graphics", page_number + 1)
-            else:
-                logger.debug("Processing page %d: regular text + embedded raster images", page_number + 1)
-                parts.append(f"========[Page {page_number + 1} regular text + embedded raster images]=======\n")
-                if not blocks:
-                    logger.debug("No text or images found on page %d", page_number + 1)
-                for block in blocks:
-                    if block.get("type") == 0:
-                        for line in block.get("lines", []):
-                            for span in line.get("spans", []):
-                                parts.append(span.get("text", ""))
-                    elif block.get("type") == 1:
-                        parts.append(f"========[Image {image_counter}]========\n")
-                        img_bytes = block.get("image")
-                        w = block.get("width", 0)
-                        h = block.get("height", 0)
-                        if w * h < MIN_IMG_PIXELS:
-                            continue
-                        img_ext = block.get("ext", "png")
-                        base_name = f"{os.path.splitext(self.file_name)[0]}_img{image_counter}"
-                        unique_name = _generate_unique_image_name("pdf", base_name, img_ext)
-                        img_path = os.path.join(self.images_dir, unique_name)
-                        try:
-                            _save_image_data(img_bytes, img_path)
-                            self.images.append(img_path)
-                            if vision_calls < MAX_VISION_CALLS_PER_PAGE:
-                                desc = self._generate_image_description(img_path)
-                                vision_calls += 1
-                            else:
-                                desc = "(description skipped — Vision limit reached)"
-                            parts.append(f"[Image {image_counter}: {desc}] (Image saved to: {img_path})")
-                            image_counter += 1
-                        except Exception as e:
-                            logger.error("Save/describe image error: %s", e)
+                elif item["describe"]:
+                    seen_xrefs[item["xref"]] = (img_path, len(pending))
+                    pending.append((len(parts), img_path, item["data"], f"[Image {item['index']}: ", f"] (Image saved to: {img_path})"))
+                    parts.append("")
+                else:
+                    seen_xrefs[item["xref"]] = (img_path, None)
+                    parts.append(f"[Image {item['index']}: (description skipped — Vision limit reached)] (Image saved to: {img_path})")
+
+        descriptions = self._fill_image_descriptions(parts, pending)
+        for index, slot, before, after in reused:
+            parts[index] = before + descriptions[slot] + after
+        self.text_content = "".join(parts)
+
+    def _fill_image_descriptions(self, parts: List[str], pending: list) -> List[str]:
+        """
+        Describe the pending images concurrently and write each description into its
+        reserved slot: pending holds (index in parts, img_path, image bytes, text before, text after).
+        """
+        # Image bytes are already in memory; pass them on instead of re-reading the files
+        descriptions = self._generate_image_descriptions_batch(
+            [img_path for _, img_path, _, _, _ in pending],
+            [data for _, _, data, _, _ in pending],
+        )
+        for (index, _, _, before, after), desc in zip(pending, descriptions):
+            parts[index] = before + desc + after
+        return descriptions
+
+    def _add_office_image(self, parts: List[str], pending: list, data: bytes, ext: str,
+                          base_name: str, index: int, describe: bool) -> bool:
+        """
+        Save an image embedded in a .docx/.pptx and reserve its description slot in parts.
+        Returns False when the image is skipped (not PNG/JPEG, or below MIN_IMG_PIXELS).
+        """
+        ext = "." + ext.lower().lstrip(".")
+        if ext not in OFFICE_IMAGE_EXTS:
+            return False
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                width, height = img.size
+        except Exception:
+            return False
+        if width * height < MIN_IMG_PIXELS:
+            return False
+        img_path = os.path.join(self.images_dir, _generate_unique_image_name(self.file_ext[1:], base_name, ext[1:]))
+        _save_binary(data, img_path)
+        self.images.append(img_path)
+        if describe:
+            pending.append((len(parts), img_path, data, f"[Image {index}: ", f"] (Image saved to: {img_path})\n"))
+            parts.append("")
+        else:
+            parts.append(f"[Image {index}: (description skipped — Vision limit reached)] (Image saved to: {img_path})\n")
+        return True
+
+    def _process_docx(self) -> None:
+        logger.info("Processing DOCX document %s directly", self.file_path)
+        docx = _docx()
+        doc = docx.Document(self.file_path)
+        props = doc.core_properties
+        self.metadata.update({k: str(v) for k, v in (("title", props.title), ("author", props.author)) if v})
+        parts: List[str] = []
+        # Paragraphs and tables in body order
+        for block in doc.iter_inner_content():
+            if isinstance(block, docx.table.Table):
+                for row in block.rows:
+                    parts.append(" | ".join(cell.text.strip() for cell in row.cells) + "\n")
+                parts.append("\n")
+            elif block.text:
+                parts.append(block.text + "\n")
+        pending: list = []
+        stem = os.path.splitext(self.file_name)[0]
+        image_parts = [rel.target_part for rel in doc.part.rels.values()
+                       if not rel.is_external and rel.reltype.endswith("/image")]
+        if image_parts:
+            parts.append("\n========[Embedded images]========\n")
+        image_counter = 1
+        for part in image_parts:
+            if self._add_office_image(parts, pending, part.blob, os.path.splitext(part.partname)[1],
+                                      f"{stem}_img{image_counter}", image_counter,
+                                      describe=len(pending) < MAX_VISION_CALLS_PER_PAGE):
+                image_counter += 1
+        self._fill_image_descriptions(parts, pending)
+        self.text_content = "".join(parts).strip()
+        self._inject_basic_metadata()
+
+    def _process_pptx(self) -> None:
+        logger.info("Processing PPTX presentation %s directly", self.file_path)
+        pptx = _pptx()
+        prs = pptx.Presentation(self.file_path)
+        props = prs.core_properties
+        self.metadata.update({k: str(v) for k, v in (("title", props.title), ("author", props.author)) if v})
+        slides = list(prs.slides)
+        page_limit = _get_page_limit()
+        slides_to_process = min(len(slides), page_limit) if page_limit else len(slides)
+        if page_limit and len(slides) > page_limit:
+            self.metadata['page_limit_reached'] = True
+
+        def iter_shapes(shapes):
+            for shape in shapes:
+                if hasattr(shape, "shapes"):  # group
+                    yield from iter_shapes(shape.shapes)
+                else:
+                    yield shape
+
+        parts: List[str] = []
+        pending: list = []
+        stem = os.path.splitext(self.file_name)[0]
+        for slide_number, slide in enumerate(slides[:slides_to_process], 1):
+            parts.append(f"========[Slide {slide_number}]========\n")
+            vision_calls = 0
+            image_counter = 1
+            for shape in iter_shapes(slide.shapes):
+                if getattr(shape, "has_text_frame", False) and shape.text_frame.text.strip():
+                    parts.append(shape.text_frame.text + "\n")
+                elif getattr(shape, "has_table", False):
+                    for row in shape.table.rows:
+                        parts.append(" | ".join(cell.text.strip() for cell in row.cells) + "\n")
+                if not isinstance(shape, pptx.shapes.picture.Picture):
+                    continue
+                try:
+                    image = shape.image
+                    data, ext = image.blob, image.ext
+                except Exception as e:  # linked or missing picture
+                    logger.debug("No image data for shape on slide %d: %s", slide_number, e)
+                    continue
+                describe = vision_calls < MAX_VISION_CALLS_PER_PAGE
+                if self._add_office_image(parts, pending, data, ext, f"{stem}_slide{slide_number}_img{image_counter}",
+                                          image_counter, describe):
+                    image_counter += 1
+                    vision_calls += describe
             parts.append("\n---\n")
+        self._fill_image_descriptions(parts, pending)
         self.text_content = "".join(parts)
-        doc.close()
+        self._inject_basic_metadata()
 
-    def _process_txt(self) -> None:
+    def _read_text(self) -> str:
+        """Read the document as UTF-8 text (errors ignored, universal newlines), from memory if given."""
+        if self._data is not None:
+            return io.TextIOWrapper(io.BytesIO(self._data), encoding="utf-8", errors="ignore").read()
         with open(self.file_path, "r", encoding="utf-8", errors="ignore") as f:
-            self.text_content = f.read()
+            return f.read()
+
+    def _open_binary(self):
+        """Open the document for binary reading, from memory if given."""
+        if self._data is not None:
+            return io.BytesIO(self._data)
+        return open(self.file_path, "rb")
+
+    def _process_txt(self) -> None:
+        self.text_content = self._read_text()
         self._inject_basic_metadata()
 
     def _process_image(self) -> None:
@@ -745,14 +1555,6 @@ class Document:
         except Exception as e:
             raise ValueError(f"Cannot open image '{self.file_name}': {e}")
         original_format = img.format or "UNKNOWN"
-        try:
-            exif = img.getexif()
-            if exif and exif.get(274):
-                img = ImageOps.exif_transpose(img)
-        except Exception:
-            pass
-        if max(img.size) > MAX_IMAGE_DIM or self.file_size > MAX_IMAGE_SIZE:
-            img.thumbnail((MAX_IMAGE_DIM, MAX_IMAGE_DIM))
         # Normalize to standard JPEG for Vision API compatibility.
         # MPO (iPhone multi-picture), TIFF, BMP etc. are converted to JPEG.
         # PNG is kept as-is (supports transparency).
@@ -760,15 +1562,35 @@ class Document:
             fmt = "PNG"
         else:
             fmt = "JPEG"
-        # Ensure RGB mode for JPEG (no alpha channel, no palette)
-        if fmt == "JPEG" and img.mode not in ("RGB", "L"):
-            img = img.convert("RGB")
-        if original_format.upper() != fmt:
-            logger.info("Image format normalized: %s -> %s (%s)", original_format, fmt, self.file_name)
+        # Size, mode and EXIF come from the header; pixels are only decoded below if needed
+        rotated = False
+        try:
+            exif = img.getexif()
+            rotated = bool(exif and exif.get(274, 1) != 1)
+        except Exception:
+            pass
+        oversized = max(img.size) > MAX_IMAGE_DIM or self.file_size > MAX_IMAGE_SIZE
         base_name = os.path.splitext(self.file_name)[0]
         unique_name = _generate_unique_image_name("direct", base_name, fmt.lower())
         out_path = os.path.join(self.images_dir, unique_name)
-        img.save(out_path, format=fmt, quality=90)
+        if (not rotated and not oversized and original_format.upper() == fmt
+                and (fmt == "PNG" or img.mode in ("RGB", "L"))):
+            # Already a Vision-ready file: copy it instead of decoding and re-encoding
+            shutil.copyfile(self.file_path, out_path)
+        else:
+            if rotated:
+                try:
+                    img = ImageOps.exif_transpose(img)
+                except Exception:
+                    pass
+            if oversized:
+                img.thumbnail((MAX_IMAGE_DIM, MAX_IMAGE_DIM))
+            # Ensure RGB mode for JPEG (no alpha channel, no palette)
+            if fmt == "JPEG" and img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            if original_format.upper() != fmt:
+                logger.info("Image format normalized: %s -> %s (%s)", original_format, fmt, self.file_name)
+            img.save(out_path, format=fmt, quality=90, compress_level=PNG_COMPRESS_LEVEL)
         self.images.append(out_path)
         exif_data: Dict[str, str] = {}
         try:
@@ -783,8 +1605,18 @@ class Document:
         self.text_content = f"{self._generate_image_description(out_path)} (Image saved to: {out_path})"
 
     def _process_spreadsheet(self) -> None:
+        with open_excel_file_safe(self.file_path) as xls:
+            self._process_spreadsheet_sheets(xls)
+
+    def _process_spreadsheet_sheets(self, xls) -> None:
         previews: List[str] = []
-        sheet_names = get_excel_sheet_names(self.file_path)
+        if xls is not None:
+            # One open workbook for all sheets instead of re-reading the file per sheet
+            sheet_names = xls.sheet_names
+            read_sheet = xls.parse
+        else:
+            sheet_names = get_excel_sheet_names(self.file_path)
+            read_sheet = lambda sheet_name: read_excel_file_safe(self.file_path, sheet_name=sheet_name)
         if not sheet_names:
             self.text_content = "No readable sheets found"
             self.metadata['error'] = 'no_sheets'
@@ -798,53 +1630,58 @@ class Document:
         base = os.path.splitext(self.file_name)[0]
         for sheet_name in sheet_names[:sheets_to_process]:
             try:
-                df = read_excel_file_safe(self.file_path, sheet_name=sheet_name)
+                df = read_sheet(sheet_name)
                 if df.empty:
                     continue
                 csv_path = os.path.join(self.tables_dir, f"{base}_{sheet_name}.csv")
                 os.makedirs(self.tables_dir, exist_ok=True)
-                df.to_csv(csv_path, index=False)
+                csv_text = _write_csv(df, csv_path)
                 self.tables.append(csv_path)
-                previews.extend(_csv_previews(df, f"Sheet: {sheet_name}"))
+                previews.extend(_csv_previews(df, f"Sheet: {sheet_name}", csv_text=csv_text))
             except Exception as e:
                 logger.error("Error processing sheet %s: %s", sheet_name, e)
                 previews.append(f"Sheet: {sheet_name} (ERROR)\nError: {str(e)}\n")
         self.text_content = "\n".join(previews)
 
     def _process_csv(self) -> None:
-        df = pd.read_csv(self.file_path)
+        with self._open_binary() as f:
+            df = _pandas().read_csv(f)
         csv_copy = os.path.join(self.tables_dir, os.path.basename(self.file_path))
-        df.to_csv(csv_copy, index=False)
+        full_csv = _write_csv(df, csv_copy)
         self.tables.append(csv_copy)
-        full_csv = df.to_csv(index=False)
         md = df.to_markdown(index=False)
         self.text_content = (f"CSV (full):\n{full_csv}\n" f"CSV (Markdown):\n{md}")
 
     def _process_generic_text(self) -> None:
-        with open(self.file_path, "r", encoding="utf-8", errors="ignore") as f:
-            self.text_content = f.read()
+        self.text_content = self._read_text()
         self._inject_basic_metadata()
 
     def _process_rtf(self) -> None:
-        with open(self.file_path, "r", encoding="utf-8", errors="ignore") as f:
-            data = f.read()
-        self.text_content = rtf_to_text(data)
+        self.text_content = rtf_to_text(self._read_text())
         self._inject_basic_metadata()
 
     def _process_markdown(self) -> None:
-        with open(self.file_path, "r", encoding="utf-8", errors="ignore") as f:
-            md = f.read()
-        self.text_content = strip_markdown.strip_markdown(md)
+        self.text_content = strip_markdown.strip_markdown(self._read_text())
         self._inject_basic_metadata()
 
     def _process_odt(self) -> None:
+        parts: List[str] = []
+
+        def end_element(name: str) -> None:
+            if name in ("text:p", "text:h"):
+                parts.append("\n")
+
+        # Stream content.xml through expat: character data is collected in document
+        # order without holding the raw XML or a tree in memory
+        parser = expat.ParserCreate()
+        parser.CharacterDataHandler = parts.append
+        parser.EndElementHandler = end_element
         with zipfile.ZipFile(self.file_path, "r") as z:
             if "content.xml" not in z.namelist():
                 raise ValueError("ODT missing content.xml")
-            raw_xml = z.read("content.xml").decode("utf-8", errors="ignore")
-        import re
-        text = re.sub(r"<[^>]+>", "", raw_xml.replace("</text:p>", "\n"))
-        self.text_content = text.strip()
+            with z.open("content.xml") as f:
+                parser.ParseFile(f)
+        self.text_content = "".join(parts).strip()
         self._inject_basic_metadata()
 
     def _process_epub(self) -> None:
@@ -927,10 +1764,10 @@ class Document:
                         safe_sheet = _safe_name(str(sheet_name))
                         safe_table = _safe_name(str(table_name))
                         csv_path = os.path.join(self.tables_dir, f"{base_name}_{safe_sheet}_{safe_table}.csv")
-                        df = pd.DataFrame(data_rows, columns=str_headers)
-                        df.to_csv(csv_path, index=False)
+                        df = _pandas().DataFrame(data_rows, columns=str_headers)
+                        csv_text = _write_csv(df, csv_path)
                         self.tables.append(csv_path)
-                        previews.extend(_csv_previews(df, f"Sheet: {sheet_name} / Table: {table_name}"))
+                        previews.extend(_csv_previews(df, f"Sheet: {sheet_name} / Table: {table_name}", csv_text=csv_text))
                     except Exception as e:
                         logger.error("Failed exporting sheet '%s' table '%s' to CSV: %s", sheet_name, table_name, e)
                         previews.append(
@@ -967,6 +1804,9 @@ class Document:
     # --------------------------
 
     def _inject_basic_metadata(self) -> None:
+        if self._data is not None:
+            self.metadata["size_bytes"] = len(self._data)
+            return
         stat = os.stat(self.file_path)
         self.metadata.update({
             "modified_time": datetime.fromtimestamp(stat.st_mtime).isoformat(),
@@ -986,12 +1826,12 @@ class Document:
                 img_path = os.path.join(self.images_dir, unique_name)
                 _save_binary(data, img_path)
                 self.images.append(img_path)
-                self.text_content += f"{self._generate_image_description(img_path)} (Image saved to: {img_path})\n"
+                self._append_text(f"{self._generate_image_description(img_path, image_bytes=data)} (Image saved to: {img_path})\n")
             if expect_xml and xml_files:
                 with z.open(xml_files[0]) as f:
-                    self.text_content += f.read().decode("utf-8", errors="ignore")
+                    self._append_text(f.read().decode("utf-8", errors="ignore"))
             elif expect_xml and not xml_files:
-                self.text_content += "(XML not found in bundle)"
+                self._append_text("(XML not found in bundle)")
         self._inject_basic_metadata()
 
     def _convert_to_pdf(self, path: str, timeout: int = 120) -> str:
@@ -1007,7 +1847,7 @@ class Document:
         output_dir = os.path.dirname(path)
         try:
             subprocess.run(
-                [soffice, "--headless", "--convert-to", "pdf", "--outdir", output_dir, path],
+                _soffice_command(soffice, output_dir, [path]),
                 check=True,
                 timeout=timeout,
                 capture_output=True
@@ -1016,6 +1856,9 @@ class Document:
             logger.error("LibreOffice conversion timed out after %ds for %s", timeout, path)
             raise TimeoutError(f"LibreOffice conversion timed out after {timeout}s")
         pdf_path = os.path.splitext(path)[0] + ".pdf"
+        if not os.path.exists(pdf_path):
+            # soffice can exit 0 without writing anything (e.g. its profile is locked)
+            raise OSError(f"LibreOffice produced no PDF for '{os.path.basename(path)}'")
         logger.debug("Converted '%s' to PDF via %s", path, soffice)
         return pdf_path
 
@@ -1035,17 +1878,18 @@ class Document:
             return b64_string
         llm = LLMConfig(model=model)
         try:
-            response_content = llm.get_completion(
-                messages=[
-                    {"role": "system", "content": "Return only one integer: 0, 90, 180, or 270. This is the clockwise rotation needed to make the document upright."},
-                    {"role": "user", "content": [
-                        {"type": "text", "text": "Clockwise rotation? Return just the number (0/90/180/270)."},
-                        {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{b64_string}"}},
-                    ]},
-                ],
-                max_tokens=20,
-                temperature=None,
-            )
+            with _vision_slots:
+                response_content = llm.get_completion(
+                    messages=[
+                        {"role": "system", "content": "Return only one integer: 0, 90, 180, or 270. This is the clockwise rotation needed to make the document upright."},
+                        {"role": "user", "content": [
+                            {"type": "text", "text": "Clockwise rotation? Return just the number (0/90/180/270)."},
+                            {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{b64_string}"}},
+                        ]},
+                    ],
+                    max_tokens=20,
+                    temperature=None,
+                )
             # Accept either plain string or JSON-like dict
             if isinstance(response_content, dict):
                 angle = response_content.get("angle")
@@ -1063,44 +1907,105 @@ class Document:
                 rotated_img = img.rotate(-angle, expand=True)
                 buffered = io.BytesIO()
                 img_format = img.format or "JPEG"
-                rotated_img.save(buffered, format=img_format)
+                rotated_img.save(buffered, format=img_format, compress_level=PNG_COMPRESS_LEVEL)
                 return base64.b64encode(buffered.getvalue()).decode()
             return b64_string
         except Exception as e:
             logger.error("OpenAI orientation detection failed: %s", e)
             return b64_string
 
-    def _generate_image_description(self, image_path: str, *, model: str = DOCS_VISION_MODEL, max_tokens: int = 5000, timeout: float = 180) -> str:
+    def _generate_image_descriptions_batch(
+        self,
+        image_paths: List[str],
+        image_bytes: Optional[List[Optional[bytes]]] = None,
+    ) -> List[str]:
+        """
+        Describe several images concurrently, returning descriptions in input order.
+        image_bytes optionally holds each image's content (None entries are read from disk).
+        At most VISION_CONCURRENCY requests are in flight process-wide; a failure for one image
+        yields "(description failed)" without affecting the others. Images with the
+        same content (same Vision cache key) are described once.
+        """
+        if image_bytes is None:
+            image_bytes = [None] * len(image_paths)
+        keys: List[str] = []
+        for i, (image_path, data) in enumerate(zip(image_paths, image_bytes)):
+            try:
+                with _image_buffer(image_path, data) as buf:
+                    keys.append(_vision_cache_key(buf, DOCS_VISION_MODEL))
+            except OSError:
+                keys.append(f"unreadable:{i}")  # described on its own, where the error is reported
+        first_index: Dict[str, int] = {}
+        unique = [i for i, key in enumerate(keys) if first_index.setdefault(key, i) == i]
+
+        def describe(image_path: str, data: Optional[bytes]) -> str:
+            try:
+                return self._generate_image_description(image_path, image_bytes=data)
+            except Exception as e:
+                logger.error("Save/describe image error: %s", e)
+                self._cacheable = False
+                return "(description failed)"
+
+        paths = [image_paths[i] for i in unique]
+        datas = [image_bytes[i] for i in unique]
+        if len(unique) <= 1:
+            described = [describe(p, d) for p, d in zip(paths, datas)]
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(unique), VISION_CONCURRENCY)) as ex:
+                described = list(ex.map(describe, paths, datas))
+        by_key = {keys[i]: desc for i, desc in zip(unique, described)}
+        return [by_key[key] for key in keys]
+
+    def _generate_image_description(self, image_path: str, *, image_bytes: Optional[bytes] = None, model: str = DOCS_VISION_MODEL, max_tokens: int = 5000, timeout: float = 180) -> str:
         """
         Uses DOCS_VISION_MODEL from .env as the single source of truth.
+        Descriptions are cached by image content, model and prompt (see VISION_CACHE_DIR).
+        Pass image_bytes when the content is already in memory to skip reading image_path.
         """
-        api_key = _get_api_key()
-        if not api_key:
-            logger.warning("API_KEY not set; skipping Vision description.")
-            return "(description unavailable)"
-        with open(image_path, "rb") as img_file:
-            b64 = base64.b64encode(img_file.read()).decode()
+        with _image_buffer(image_path, image_bytes) as buf:
+            cache_key = _vision_cache_key(buf, model)
+            cached = _vision_cache_get(cache_key)
+            if cached is not None:
+                logger.debug("Vision cache hit for %s", image_path)
+                return cached
+            api_key = _get_api_key()
+            if not api_key:
+                logger.warning("API_KEY not set; skipping Vision description.")
+                self._cacheable = False
+                return "(description unavailable)"
+            ext = os.path.splitext(image_path)[1].lower()
+            payload = buf
+            if len(buf) > VISION_MAX_PAYLOAD_BYTES:
+                try:
+                    payload = _downscale_for_vision(buf, "PNG" if ext == ".png" else "JPEG")
+                except Exception as e:
+                    logger.debug("Cannot downscale %s for Vision: %s", image_path, e)
+            b64 = base64.b64encode(payload).decode()
         # Correct orientation before sending to description
         b64 = self._fix_image_orientation(b64_string=b64)
         # Detect MIME type from file extension
-        ext = os.path.splitext(image_path)[1].lower()
         mime_type = "image/png" if ext == ".png" else "image/jpeg"
         llm = LLMConfig(model=model)
         try:
-            completion = llm.get_completion(
-                messages=[
-                    {"role": "user", "content": [
-                        {"type": "text", "text": AI_IMAGE_DESCRIPTION_PROMPT},
-                        {"type": "image_url", "image_url": {"url": f"data:{mime_type};base64,{b64}"}},
-                    ]}
-                ],
-                max_tokens=max_tokens,
-                temperature=0,
-            )
-            return completion.strip() if isinstance(completion, str) else str(completion)
+            with _vision_slots:
+                completion = llm.get_completion(
+                    messages=[
+                        {"role": "user", "content": [
+                            {"type": "text", "text": AI_IMAGE_DESCRIPTION_PROMPT},
+                            {"type": "image_url", "image_url": {"url": f"data:{mime_type};base64,{b64}"}},
+                        ]}
+                    ],
+                    max_tokens=max_tokens,
+                    temperature=0,
+                )
+            desc = completion.strip() if isinstance(completion, str) else str(completion)
         except Exception as e:
             logger.error("OpenAI image description failed: %s", e)
+            self._cacheable = False
             return "(description failed)"
+        if desc:
+            _vision_cache_set(cache_key, desc)
+        return desc
 
     def _process_email(self) -> None:
         # Parse .eml, extract headers/body, save attachments and process them
@@ -1109,7 +2014,7 @@ class Document:
         attachments_info: List[str] = []
         attachments_processed = 0
         try:
-            with open(self.file_path, "rb") as f:
+            with self._open_binary() as f:
                 msg = BytesParser(policy=policy.default).parse(f)
         except Exception as e:
             self.text_content = f"(failed to parse email: {e})"
@@ -1158,14 +2063,15 @@ class Document:
                         try:
                             child_doc = Document(dest, media_dir=self.media_dir)
                             child_doc.process()
+                            self._cacheable = self._cacheable and child_doc._cacheable
                             self.images.extend(child_doc.images)
-                            if hasattr(child_doc, 'tables'):
-                                self.tables.extend(child_doc.tables)
+                            self.tables.extend(child_doc.tables)
                             attachments_info.append(f"Attachment processed: {os.path.basename(dest)}")
                             # Append a short preview of child content
                             preview = child_doc.text_content[:500]
                             body_text += f"\n---\n[Attachment content preview: {os.path.basename(dest)}]\n{preview}\n"
                         except Exception as ce:
+                            self._cacheable = False
                             attachments_info.append(f"Attachment processing failed: {os.path.basename(dest)} ({ce})")
                     except Exception as se:
                         attachments_info.append(f"Attachment save failed: {filename} ({se})")
@@ -1215,6 +2121,55 @@ class Document:
     # Generic ZIP/RAR
     # --------------------------
 
+    def _process_archive_child(self, dest_path: str, converted_pdf: Optional[str] = None,
+                               data: Optional[bytes] = None) -> "Document":
+        child_doc = Document(dest_path, media_dir=self.media_dir, data=data)
+        child_doc._converted_pdf = converted_pdf
+        child_doc.process()
+        return child_doc
+
+    @staticmethod
+    def _needs_pdf_conversion(ext: str) -> bool:
+        if ext in EXCEL_EXTS and _is_direct_excel_enabled():
+            return False
+        return ext in OFFICE_CONVERT_EXTS and not (_is_direct_office_enabled() and _can_read_office_directly(ext))
+
+    def _submit_office_members(self, pool, members: list, office: list) -> None:
+        """
+        Convert the Office members collected during extraction in one LibreOffice
+        batch, then submit them to the pool. office holds (index in members, name, dest_path).
+        """
+        converted = _convert_to_pdf_batch([path for _, _, path in office]) if len(office) > 1 else {}
+        for index, name, dest_path in office:
+            members[index] = (name, pool.submit(self._process_archive_child, dest_path, converted.get(dest_path)))
+
+    def _collect_archive_members(self, members: list) -> int:
+        """
+        Append archive member output in archive order. members holds notes (str)
+        and (name, future) tuples for members submitted to the processing pool.
+        Returns the number of members processed successfully.
+        """
+        useful_files = 0
+        for member in members:
+            if isinstance(member, str):
+                self._append_text(member)
+                continue
+            name, future = member
+            try:
+                child_doc = future.result()
+                self._cacheable = self._cacheable and child_doc._cacheable
+                useful_files += 1
+                # Take over the child's unjoined parts so nested archives are joined once, at the top
+                self._append_text(f"\n===== [Extracted: {name}] =====\n")
+                self._text_parts.extend(child_doc._text_parts)
+                self._append_text("\n")
+                self.images.extend(child_doc.images)
+                self.tables.extend(child_doc.tables)
+            except Exception as e:
+                logger.error("Failed processing '%s' inside '%s': %s", name, self.file_name, e)
+                self._cacheable = False
+        return useful_files
+
     def _process_generic_zip(self) -> None:
         logger.info("Processing ZIP archive '%s' (%d bytes)", self.file_name, self.file_size)
         if self.file_size > MAX_ZIP_SIZE:
@@ -1222,60 +2177,69 @@ class Document:
             logger.warning("%s %s", self.file_name, msg)
             self.text_content = msg
             return
+        # Created on the first member extracted to disk, so unreadable, empty or all-in-memory archives leave no directory behind
         extracted_root = os.path.join(self.media_dir, "unzipped", os.path.splitext(self.file_name)[0])
-        os.makedirs(extracted_root, exist_ok=True)
-        useful_files = 0
-        try:
-            with zipfile.ZipFile(self.file_path, "r") as z:
-                names = z.namelist()
-                if len(names) > MAX_ZIP_FILES:
-                    logger.info("ZIP %s has %d entries; only first %d will be processed", self.file_name, len(names), MAX_ZIP_FILES)
-                for idx, name in enumerate(names):
-                    if idx >= MAX_ZIP_FILES:
-                        break
-                    if name.endswith("/"):
-                        continue
-                    _, ext = os.path.splitext(name)
-                    ext = ext.lower()
-                    if ext in ARCHIVE_ALLOWED_EXTS:
-                        try:
-                            info = z.getinfo(name)
+        members: list = []  # notes (str) and (name, future) in archive order
+        office: list = []  # Office members, converted to PDF together once extraction is done
+        # Members are handed to the pool as soon as they are written, so extraction
+        # of the next entry overlaps with processing of the previous ones
+        with ThreadPoolExecutor(max_workers=ARCHIVE_WORKERS) as pool:
+            try:
+                with zipfile.ZipFile(self.file_path, "r") as z:
+                    # One pass over the central directory: names and sizes come from the same ZipInfo
+                    infos = z.infolist()
+                    if len(infos) > MAX_ZIP_FILES:
+                        logger.info("ZIP %s has %d entries; only first %d will be processed", self.file_name, len(infos), MAX_ZIP_FILES)
+                    # Classify the processed slice once: (ZipInfo, lower-cased extension), directories dropped
+                    classified = [(info, os.path.splitext(info.filename)[1].lower())
+                                  for info in infos[:MAX_ZIP_FILES] if not info.is_dir()]
+                    for info, ext in classified:
+                        name = info.filename
+                        if ext in ARCHIVE_ALLOWED_EXTS:
                             if info.file_size > MAX_ARCHIVE_MEMBER_SIZE:
                                 msg = (f"(member skipped due to size limit: {name} size {info.file_size} B > "
                                        f"{MAX_ARCHIVE_MEMBER_SIZE} B)")
                                 logger.warning("%s %s", self.file_name, msg)
-                                self.text_content += f"\n{msg}\n"
+                                members.append(f"\n{msg}\n")
                                 continue
-                        except KeyError:
-                            # Fallback if info missing; proceed
-                            pass
-                        dest_path = _safe_join_path(extracted_root, name)
-                        if os.path.exists(dest_path):
-                            dest_path = _ensure_unique_path(dest_path)
-                        with z.open(name) as src, open(dest_path, "wb") as dst:
-                            shutil.copyfileobj(src, dst)
-                        logger.info("Extracted %s from %s", name, self.file_name)
-                        try:
-                            child_doc = Document(dest_path, media_dir=self.media_dir)
-                            child_doc.process()
-                            useful_files += 1
-                            self.text_content += (f"\n===== [Extracted: {name}] =====\n" f"{child_doc.text_content}\n")
-                            self.images.extend(child_doc.images)
-                            if hasattr(child_doc, "tables"):
-                                self.tables.extend(child_doc.tables)
-                        except Exception as e:
-                            logger.error("Failed processing '%s' inside '%s': %s", name, self.file_name, e)
-                    else:
-                        logger.debug("Skipping unsupported entry '%s' in %s", name, self.file_name)
-        except Exception as e:
-            logger.error("Cannot open ZIP '%s': %s", self.file_name, e)
-            self.text_content = "(zip archive corrupted or unreadable)"
-            return
+                            if (info.file_size > MIN_BOMB_CHECK_SIZE
+                                    and info.file_size > MAX_ARCHIVE_COMPRESSION_RATIO * max(info.compress_size, 1)):
+                                msg = (f"(member skipped as a likely zip bomb: {name} expands "
+                                       f"{info.compress_size} B -> {info.file_size} B)")
+                                logger.warning("%s %s", self.file_name, msg)
+                                members.append(f"\n{msg}\n")
+                                continue
+                            if ext in ARCHIVE_IN_MEMORY_EXTS and 0 < info.file_size <= ARCHIVE_IN_MEMORY_MAX_SIZE:
+                                with z.open(info) as src:
+                                    data = src.read()
+                                child_path = _safe_join_path(extracted_root, name)
+                                members.append((name, pool.submit(self._process_archive_child, child_path, data=data)))
+                                continue
+                            dest_path = _safe_join_path(extracted_root, name)
+                            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                            if os.path.exists(dest_path):
+                                dest_path = _ensure_unique_path(dest_path)
+                            _extract_zip_member(z, info, dest_path)
+                            logger.info("Extracted %s from %s", name, self.file_name)
+                            if self._needs_pdf_conversion(ext):
+                                office.append((len(members), name, dest_path))
+                                members.append((name, None))
+                            else:
+                                members.append((name, pool.submit(self._process_archive_child, dest_path)))
+                        else:
+                            logger.debug("Skipping unsupported entry '%s' in %s", name, self.file_name)
+            except Exception as e:
+                logger.error("Cannot open ZIP '%s': %s", self.file_name, e)
+                self.text_content = "(zip archive corrupted or unreadable)"
+                return
+            self._submit_office_members(pool, members, office)
+            useful_files = self._collect_archive_members(members)
         if useful_files == 0:
             self.text_content = "(zip contains no supported documents or images)"
         self._inject_basic_metadata()
 
     def _process_generic_rar(self) -> None:
+        rarfile = _rarfile()
         if rarfile is None:
             msg = "(rarfile module not installed; .rar skipped)"
             logger.warning("%s %s", self.file_name, msg)
@@ -1287,74 +2251,79 @@ class Document:
             logger.warning("%s %s", self.file_name, msg)
             self.text_content = msg
             return
+        # Created on the first member extracted to disk, so unreadable, empty or all-in-memory archives leave no directory behind
         extracted_root = os.path.join(self.media_dir, "unrarred", os.path.splitext(self.file_name)[0])
-        os.makedirs(extracted_root, exist_ok=True)
-        useful_files = 0
-        try:
-            with rarfile.RarFile(self.file_path) as rf:
-                # Prefer detailed infos if available
-                if hasattr(rf, 'infolist'):
-                    entries = [(i.filename, getattr(i, 'file_size', 0)) for i in rf.infolist()]
-                else:
-                    names = rf.namelist()
-                    entries = [(n, 0) for n in names]
-                if len(entries) > MAX_RAR_FILES:
-                    logger.info("RAR %s has %d entries; only first %d will be processed", self.file_name, len(entries), MAX_RAR_FILES)
-                for idx, (name, fsize) in enumerate(entries):
-                    if idx >= MAX_RAR_FILES:
-                        break
-                    if name.endswith("/"):
-                        continue
-                    _, ext = os.path.splitext(name)
-                    ext = ext.lower()
-                    if ext in ARCHIVE_ALLOWED_EXTS:
-                        try:
-                            size_ok = True
-                            if fsize and fsize > MAX_ARCHIVE_MEMBER_SIZE:
-                                size_ok = False
-                            if not size_ok:
-                                msg = (f"(member skipped due to size limit: {name} size {fsize} B > "
-                                       f"{MAX_ARCHIVE_MEMBER_SIZE} B)")
-                                logger.warning("%s %s", self.file_name, msg)
-                                self.text_content += f"\n{msg}\n"
-                                continue
-                        except Exception:
-                            pass
-                        dest_path = _safe_join_path(extracted_root, name)
-                        if os.path.exists(dest_path):
-                            dest_path = _ensure_unique_path(dest_path)
-                        with rf.open(name) as src, open(dest_path, "wb") as dst:
-                            shutil.copyfileobj(src, dst)
-                        logger.info("Extracted %s from %s", name, self.file_name)
-                        try:
-                            child_doc = Document(dest_path, media_dir=self.media_dir)
-                            child_doc.process()
-                            useful_files += 1
-                            self.text_content += (f"\n===== [Extracted: {name}] =====\n" f"{child_doc.text_content}\n")
-                            self.images.extend(child_doc.images)
-                            if hasattr(child_doc, "tables"):
-                                self.tables.extend(child_doc.tables)
-                        except Exception as e:
-                            logger.error("Failed processing '%s' inside '%s': %s", name, self.file_name, e)
-                    else:
-                        logger.debug("Skipping unsupported entry '%s' in %s", name, self.file_name)
-        except Exception as e:
-            # Try to classify common rarfile exceptions for better UX
-            msg = None
+        members: list = []  # notes (str) and (name, future) in archive order
+        office: list = []  # Office members, converted to PDF together once extraction is done
+        # Members are handed to the pool as soon as they are written, so extraction
+        # of the next entry overlaps with processing of the previous ones
+        with ThreadPoolExecutor(max_workers=ARCHIVE_WORKERS) as pool:
             try:
-                PR = getattr(rarfile, 'PasswordRequired', None)
-                BR = getattr(rarfile, 'BadRarFile', None)
-                if PR and isinstance(e, PR):
-                    msg = "(rar is password-protected; skipped)"
-                elif BR and isinstance(e, BR):
-                    msg = "(rar archive corrupted or unreadable)"
-            except Exception:
-                pass
-            if msg is None:
-                msg = f"(rar open failed: {e})"
-            logger.error("%s: %s", self.file_name, msg)
-            self.text_content = msg
-            return
+                with rarfile.RarFile(self.file_path) as rf:
+                    # Prefer detailed infos if available
+                    if hasattr(rf, 'infolist'):
+                        entries = [(i.filename, getattr(i, 'file_size', 0)) for i in rf.infolist()]
+                    else:
+                        names = rf.namelist()
+                        entries = [(n, 0) for n in names]
+                    if len(entries) > MAX_RAR_FILES:
+                        logger.info("RAR %s has %d entries; only first %d will be processed", self.file_name, len(entries), MAX_RAR_FILES)
+                    # Classify the processed slice once: (name, size, lower-cased extension), directories dropped
+                    classified = [(name, fsize, os.path.splitext(name)[1].lower())
+                                  for name, fsize in entries[:MAX_RAR_FILES] if not name.endswith("/")]
+                    for name, fsize, ext in classified:
+                        if ext in ARCHIVE_ALLOWED_EXTS:
+                            try:
+                                size_ok = True
+                                if fsize and fsize > MAX_ARCHIVE_MEMBER_SIZE:
+                                    size_ok = False
+                                if not size_ok:
+                                    msg = (f"(member skipped due to size limit: {name} size {fsize} B > "
+                                           f"{MAX_ARCHIVE_MEMBER_SIZE} B)")
+                                    logger.warning("%s %s", self.file_name, msg)
+                                    members.append(f"\n{msg}\n")
+                                    continue
+                            except Exception:
+                                pass
+                            if ext in ARCHIVE_IN_MEMORY_EXTS and 0 < fsize <= ARCHIVE_IN_MEMORY_MAX_SIZE:
+                                with rf.open(name) as src:
+                                    data = src.read()
+                                child_path = _safe_join_path(extracted_root, name)
+                                members.append((name, pool.submit(self._process_archive_child, child_path, data=data)))
+                                continue
+                            dest_path = _safe_join_path(extracted_root, name)
+                            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                            if os.path.exists(dest_path):
+                                dest_path = _ensure_unique_path(dest_path)
+                            with rf.open(name) as src, open(dest_path, "wb") as dst:
+                                _copy_stream(src, dst)
+                            logger.info("Extracted %s from %s", name, self.file_name)
+                            if self._needs_pdf_conversion(ext):
+                                office.append((len(members), name, dest_path))
+                                members.append((name, None))
+                            else:
+                                members.append((name, pool.submit(self._process_archive_child, dest_path)))
+                        else:
+                            logger.debug("Skipping unsupported entry '%s' in %s", name, self.file_name)
+            except Exception as e:
+                # Try to classify common rarfile exceptions for better UX
+                msg = None
+                try:
+                    PR = getattr(rarfile, 'PasswordRequired', None)
+                    BR = getattr(rarfile, 'BadRarFile', None)
+                    if PR and isinstance(e, PR):
+                        msg = "(rar is password-protected; skipped)"
+                    elif BR and isinstance(e, BR):
+                        msg = "(rar archive corrupted or unreadable)"
+                except Exception:
+                    pass
+                if msg is None:
+                    msg = f"(rar open failed: {e})"
+                logger.error("%s: %s", self.file_name, msg)
+                self.text_content = msg
+                return
+            self._submit_office_members(pool, members, office)
+            useful_files = self._collect_archive_members(members)
         if useful_files == 0:
             self.text_content = "(rar contains no supported documents or images)"
         self._inject_basic_metadata()
@@ -1364,6 +2333,117 @@ class Document:
 # Batch utility
 ###############################################################################
 
+# Worker processes for batch_process_folder (default: all cores; 1 processes files inline)
+BATCH_WORKERS_ENV_VAR = "DOCS_BATCH_WORKERS"
+
+
+def _batch_workers() -> int:
+    try:
+        return max(1, int(os.getenv(BATCH_WORKERS_ENV_VAR, "") or os.cpu_count() or 1))
+    except ValueError:
+        logger.warning("Invalid %s, using %d", BATCH_WORKERS_ENV_VAR, os.cpu_count() or 1)
+        return os.cpu_count() or 1
+
+
+def _init_batch_worker() -> None:
+    # Files are already processed in parallel; don't fan PDF pages out to more processes
+    global PDF_PAGE_WORKERS
+    PDF_PAGE_WORKERS = 1
+
+
+def _iter_batch_files(root: str):
+    """
+    Yield os.DirEntry objects for the files under root, top-down: a directory's
+    files sorted by name, then its subdirectories (sorted; symlinked directories
+    are not followed). File/dir checks use the entries' cached type, so
+    enumeration needs no stat() per file.
+    """
+    try:
+        with os.scandir(root) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError as e:  # unreadable directory: skip it, as os.walk did
+        logger.warning("Cannot list %s: %s", root, e)
+        return
+    subdirs = []
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            subdirs.append(entry)
+        elif entry.is_file():
+            yield entry
+    for entry in subdirs:
+        yield from _iter_batch_files(entry.path)
+
+
+def _in_task_order(order: List[int], outcomes):
+    """Re-sequence outcomes produced for tasks[order[0]], tasks[order[1]], ... into task order."""
+    pending = {}
+    next_index = 0
+    for index, outcome in zip(order, outcomes):
+        pending[index] = outcome
+        while next_index in pending:
+            yield pending.pop(next_index)
+            next_index += 1
+
+
+def _iter_batch_outcomes(tasks: List[Tuple[str, str]], inodes: List[int]):
+    """
+    Yield _process_one results in task order. Documents are independent, so they are
+    parsed in worker processes (DOCS_BATCH_WORKERS); small chunks keep disk access spread out.
+    Files are read in inode order, which follows the on-disk layout more closely than
+    names do; results that finish ahead of their turn are held until it comes.
+    """
+    order = sorted(range(len(tasks)), key=inodes.__getitem__)
+    workers = min(_batch_workers(), len(tasks))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker) as ex:
+            yield from _in_task_order(order, ex.map(_process_one, [tasks[i] for i in order], chunksize=4))
+    else:
+        yield from _in_task_order(order, (_process_one(tasks[i]) for i in order))
+
+
+def _copy_if_absent(src: str, dst: str) -> None:
+    """Copy src to dst with metadata (like shutil.copy2) unless dst already exists."""
+    try:
+        with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+            _copy_stream(fsrc, fdst)
+    except FileExistsError:
+        return
+    shutil.copystat(src, dst)
+
+
+def _process_one(task: Tuple[str, str]) -> Tuple[Optional[dict], Optional[str]]:
+    """Process one batch file; returns (doc_info, None) or (None, error message)."""
+    rel_path, dest_path = task
+    file_name = os.path.basename(dest_path)
+    file_ext = _file_ext(file_name)
+    if not Document.supports(file_ext) and not file_name.startswith("~$"):
+        # Same record process() would produce, without building a Document (media dirs, cache fingerprint)
+        logger.warning("Unsupported file format: %s", file_ext)
+        return {
+            'rel_path': rel_path,
+            'file_ext': file_ext,
+            'file_size': os.path.getsize(dest_path) if os.path.exists(dest_path) else 0,
+            'metadata': {},
+            'text_content': f"(Unsupported file format: {file_ext})",
+            'absolute_path': dest_path,
+            'tables': [],
+        }, None
+    try:
+        doc = Document(dest_path)
+        doc.process()
+    except Exception as e:
+        return None, str(e)
+    return {
+        'rel_path': rel_path,
+        'file_ext': doc.file_ext,
+        'file_size': doc.file_size,
+        'metadata': doc.metadata,
+        'text_content': doc.text_content,
+        'absolute_path': dest_path,
+        'tables': getattr(doc, 'tables', []),
+    }, None
+
+
 def batch_process_folder(
     input_folder: str,
     output_file: str = None,
@@ -1373,55 +2453,74 @@ def batch_process_folder(
 ) -> list:
     _ensure_dirs()
     docs = []  # type: List[dict]
-    results: List[str] = []
-    if not return_docs:
-        results.append("=== Batch processing report ===\n")
-    for root, _, files in os.walk(input_folder):
-        for name in sorted(files):
-            if name.startswith("."):
-                continue
-            abs_path = os.path.join(root, name)
-            rel_path = os.path.relpath(abs_path, input_folder)
-            dest_path = os.path.join("media_for_processing", rel_path)
-            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-            if not os.path.exists(dest_path):
-                shutil.copy2(abs_path, dest_path)
-            if not return_docs:
-                results.append("======================================")
-                results.append(f"File: {rel_path}")
+    tasks: List[Tuple[str, str]] = []
+    inodes: List[int] = []  # source inode per task (d_ino from scandir, no extra stat on POSIX)
+    created_dirs = set()
+    can_link = True  # cleared after the first failed link (e.g. cross-device) to stop retrying
+    for entry in _iter_batch_files(input_folder):
+        if entry.name.startswith("."):
+            continue
+        abs_path = entry.path
+        rel_path = os.path.relpath(abs_path, input_folder)
+        dest_path = os.path.join("media_for_processing", rel_path)
+        dest_dir = os.path.dirname(dest_path)
+        if dest_dir not in created_dirs:
+            os.makedirs(dest_dir, exist_ok=True)
+            created_dirs.add(dest_dir)
+        # Inputs are only read, so a hardlink avoids copying the data on the same filesystem.
+        # Both link and copy fail on an existing target, so there is no separate exists() check.
+        if can_link:
             try:
-                doc = Document(dest_path)
-                doc.process()
-                doc_info = {
-                    'rel_path': rel_path,
-                    'file_ext': doc.file_ext,
-                    'file_size': doc.file_size,
-                    'metadata': doc.metadata,
-                    'text_content': doc.text_content,
-                    'absolute_path': dest_path,
-                    'tables': getattr(doc, 'tables', []),
-                }
+                os.link(abs_path, dest_path)
+            except FileExistsError:
+                pass
+            except OSError:
+                can_link = False
+        if not can_link:
+            _copy_if_absent(abs_path, dest_path)
+        tasks.append((rel_path, dest_path))
+        inodes.append(entry.inode())
+    # The report is written record by record as results arrive instead of being joined at the end
+    report = None
+    if output_file and not return_docs:
+        if os.path.dirname(output_file):
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        report = open(output_file, "w", encoding="utf-8", buffering=_COPY_BUF_SIZE)
+    first_line = True
+
+    def emit(line: str) -> None:
+        nonlocal first_line
+        if report is None:
+            return
+        if not first_line:
+            report.write("\n")
+        report.write(line)
+        first_line = False
+
+    try:
+        emit("=== Batch processing report ===\n")
+        for (rel_path, _), (doc_info, error) in zip(tasks, _iter_batch_outcomes(tasks, inodes)):
+            emit("======================================")
+            emit(f"File: {rel_path}")
+            if error is not None:
+                emit(f"ERROR: {error}")
+            else:
                 docs.append(doc_info)
-                if not return_docs:
-                    results.append(f"Type: {doc.file_ext}")
-                    results.append(f"Size: {doc.file_size} bytes")
-                    results.append("----------- Metadata -----------")
-                    results.extend(f"{k}: {v}" for k, v in doc.metadata.items())
-                    results.append("----------- Content -----------")
-                    if preview_chars is None:
-                        results.append(doc.text_content)
-                    else:
-                        txt = doc.text_content
-                        results.append(txt[:preview_chars] + ("..." if len(txt) > preview_chars else ""))
-            except Exception as e:
-                results.append(f"ERROR: {e}")
-            if not return_docs:
-                results.append("======================================\n")
-    if return_docs:
-        return docs
-    if output_file:
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write("\n".join(results))
+                emit(f"Type: {doc_info['file_ext']}")
+                emit(f"Size: {doc_info['file_size']} bytes")
+                emit("----------- Metadata -----------")
+                for k, v in doc_info['metadata'].items():
+                    emit(f"{k}: {v}")
+                emit("----------- Content -----------")
+                if preview_chars is None:
+                    emit(doc_info['text_content'])
+                else:
+                    txt = doc_info['text_content']
+                    emit(txt[:preview_chars] + ("..." if len(txt) > preview_chars else ""))
+            emit("======================================\n")
+    finally:
+        if report is not None:
+            report.close()
+    if report is not None:
         print(f"Batch processing completed. Report at {output_file}")
     return docs
@@ -0,0 +1,46 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import documents_processor as dp
+
+
+class DocumentCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self._cache_dir = dp.DOC_CACHE_DIR
+        dp.DOC_CACHE_DIR = os.path.join(self.tmp, "doc_cache")
+        self.addCleanup(setattr, dp, "DOC_CACHE_DIR", self._cache_dir)
+        self.media_dir = os.path.join(self.tmp, "media")
+
+    def _write(self, name, content, mtime):
+        path = os.path.join(self.tmp, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_identical_files_keep_their_own_name_and_metadata(self):
+        a_path = self._write("a.txt", "same content\n", 1_600_000_000)
+        b_path = self._write("b.txt", "same content\n", 1_700_000_000)
+
+        a = dp.Document(a_path, media_dir=self.media_dir)
+        a.process()
+        b = dp.Document(b_path, media_dir=self.media_dir)
+        b.process()
+
+        # b.txt is served from the entry a.txt created
+        self.assertEqual(len(os.listdir(dp.DOC_CACHE_DIR)), 1)
+        self.assertEqual(b.text_content, a.text_content)
+        self.assertEqual(b.file_path, b_path)
+        self.assertEqual(b.file_name, "b.txt")
+        self.assertEqual(b.file_ext, ".txt")
+        self.assertNotEqual(b.metadata["modified_time"], a.metadata["modified_time"])
+        b_stat = os.stat(b_path)
+        self.assertEqual(b.metadata["size_bytes"], b_stat.st_size)
+
+
+if __name__ == "__main__":
+    unittest.main()